@@ -1,23 +1,146 @@
+import os
+import time
+
+_import_started = time.perf_counter()
+
+from dotenv import load_dotenv
+
+# 여러 모듈이 import 시점에 os.getenv 를 읽으므로 .env 는 가장 먼저 한 번만 로드
+load_dotenv()
+
 from flask import Flask
+from db import engine_options
+from db.routing import replica_binds, init_read_replica
 from db.models import db
 from routes import register_routes
-from dotenv import load_dotenv
-import os
+from cli import register_commands
+from utils.metrics import metrics, init_request_metrics
+from utils.tracing import init_tracing
+from utils.profiler import init_profiler
+from utils.fallback import check_fallback_tables
+
+# 기동 단계별 소요 시간 (/metrics 의 startup 게이지, STARTUP_REPORT=1 이면 출력)
+STARTUP = {"import_seconds": round(time.perf_counter() - _import_started, 4)}
+metrics.register_gauge("startup", lambda: STARTUP)
+
+
+class PhaseTimer:
+    def __init__(self, name):
+        self.phases = STARTUP.setdefault(name, {})
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round(now - self.last, 4)
+        self.last = now
+
 
 def create_app():
+    timer = PhaseTimer("create_app")
     app = Flask(__name__)
-    load_dotenv()
 
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+    replica_url = os.getenv("DATABASE_REPLICA_URL")
+    app.config["SQLALCHEMY_BINDS"] = replica_binds(replica_url, engine_options(replica_url))
 
+    check_fallback_tables()
     db.init_app(app)
+    timer.mark("db_init")
     register_routes(app)
+    register_commands(app)
+    init_read_replica(app)
+    timer.mark("routes")
+    init_request_metrics(app)
+    init_tracing(app)
+    init_profiler(app)
+    metrics.register_gauge("db_pool", lambda: pool_status(app))
+    timer.mark("metrics")
+
+    # 워커가 트래픽을 받기 전에 커넥션 풀/인덱스/LLM 클라이언트 준비
+    if os.getenv("WARMUP_ON_STARTUP", "1") == "1" and not created_for_cli():
+        warm_up(app)
+        timer.mark("warm_up")
 
+    if os.getenv("STARTUP_REPORT") == "1":
+        print("Startup:", STARTUP)
     return app
 
-app = create_app()
+
+def created_for_cli():
+    # `flask import-users`, `flask load-catalog`, `flask upgrade-db` 등은 서버가 아니므로 워밍업 생략
+    # (uvicorn 도 click 을 쓰므로 최상위 명령이 flask 일 때만, `flask run` 은 run 명령 안에서 앱을 만들고 워밍업함)
+    import click
+    from flask.cli import FlaskGroup
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and isinstance(ctx.find_root().command, FlaskGroup) and ctx.info_name != "run"
+
+
+def warm_up(app):
+    timer = PhaseTimer("warm_up")
+    with app.app_context():
+        # 풀 크기만큼 미리 연결해 두었다가 반납 (gunicorn --preload 와 같이 쓰면 fork 전에 연결되므로 주의)
+        try:
+            pool = db.engine.pool
+            count = int(os.getenv("WARMUP_CONNECTIONS", pool.size() if hasattr(pool, "size") else 1))
+            connections = [db.engine.connect() for _ in range(count)]
+            for connection in connections:
+                connection.exec_driver_sql("SELECT 1")
+                connection.close()
+        except Exception as e:
+            print("Connection pool warm-up failed:", e)
+        timer.mark("pool")
+
+        # 추천/검색용 카탈로그, 주변 약국 인덱스 미리 생성 (실패하면 첫 요청 때 생성)
+        if os.getenv("CATALOG_INDEX_ON_STARTUP", "1") == "1":
+            from utils.catalog_index import catalog_index
+            from utils.search import medicine_search
+            try:
+                catalog_index.build()
+                medicine_search.prepare()
+            except Exception as e:
+                print("Catalog index build failed:", e)
+            timer.mark("catalog")
+
+            from utils.geo import pharmacy_index
+            try:
+                pharmacy_index.build()
+            except Exception as e:
+                print("Pharmacy index build failed:", e)
+            timer.mark("pharmacy_index")
+
+    from utils.llm import get_llm_client
+    try:
+        get_llm_client()
+    except Exception as e:
+        print("LLM client warm-up failed:", e)
+    timer.mark("llm_client")
+
+
+def pool_status(app):
+    with app.app_context():
+        pool = db.engine.pool
+        status = {"class": type(pool).__name__, "status": pool.status()}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, name):
+                status[name] = getattr(pool, name)()
+        return status
+
+
+_app = None
+
+
+def __getattr__(name):
+    # `gunicorn app:app`, `flask run` 처럼 app 을 처음 참조할 때 생성 (import 만으로는 만들지 않음)
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
+    create_app().run(host="0.0.0.0", port=port)
@@ -0,0 +1,158 @@
+"""ASGI serving mode:  uvicorn asgi:app --workers 1
+
+POST /survey/result runs natively async (async SQLAlchemy session + async LLM client), so one process can
+keep hundreds of submissions waiting on the LLM. Every other route (auth, booking, the rest of survey, ...)
+is the unchanged Flask app, served from a thread pool.
+"""
+import os
+import time
+import asyncio
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app import app as flask_app
+from db import engine_options
+from db.models import User
+from routes import survey
+from utils.security import authenticate, request_token, AuthError
+from utils.llm import get_async_llm_client, llm_guard, LLMUnavailable
+from utils.analytics import schedule_refresh
+from utils.idempotency import idempotency_store, fingerprint, acquire, finish, IdempotencyConflict
+from utils.metrics import metrics, record_request, query_stats, QueryStats
+from utils.tracing import Phases, server_timing, SERVER_TIMING
+
+ROUTE = "POST /survey/result"
+
+
+def async_database_url(url):
+    for prefix, driver in (("postgres://", "postgresql+asyncpg://"),
+                           ("postgresql://", "postgresql+asyncpg://"),
+                           ("sqlite://", "sqlite+aiosqlite://")):
+        if url.startswith(prefix):
+            return driver + url[len(prefix):]
+    return url
+
+
+_sessions = None
+
+
+def async_sessions():
+    # async 엔진은 첫 요청 때 생성
+    global _sessions
+    if _sessions is None:
+        url = os.getenv("DATABASE_URL")
+        _sessions = async_sessionmaker(create_async_engine(async_database_url(url), **engine_options(url)),
+                                       expire_on_commit=False)
+    return _sessions
+
+
+def json_response(body, status=200, headers=None):
+    # Flask jsonify 와 같은 직렬화 (datetime 등)
+    return Response(flask_app.json.dumps(body, separators=(",", ":")), status_code=status,
+                    media_type="application/json", headers=headers)
+
+
+def build_result_sync(user, objective_result, gpt_ingredients, source):
+    # 카탈로그 인덱스/검색은 Flask 세션을 쓰므로 스레드에서 실행
+    with flask_app.app_context():
+        return survey.build_result(user, objective_result, gpt_ingredients, source)
+
+
+async def survey_result(request):
+    # Flask 라우트와 같은 지표: 단계별 Server-Timing / phases, 라우트 히스토그램, X-Query-Count
+    started = time.perf_counter()
+    stats = QueryStats()
+    query_stats.set(stats)
+    phases = Phases()
+    try:
+        with phases.measure("auth"):
+            current_user = authenticate(request_token(request.cookies, request.headers))
+    except AuthError as e:
+        response = json_response({"message": e.message}, e.status)
+    else:
+        response = await idempotent_survey_result(request, current_user, phases)
+    finally:
+        metrics.observe("auth", phases.seconds["auth"])
+
+    total = time.perf_counter() - started
+    record_request(ROUTE, total, stats.count, stats.seconds)
+    metrics.record_phases(ROUTE, phases.seconds)
+    response.headers["X-Query-Count"] = str(stats.count)
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = server_timing(phases, stats.seconds, stats.count, total)
+    return response
+
+
+async def idempotent_survey_result(request, current_user, phases):
+    # Flask 의 @idempotent 와 같은 acquire/finish (대기는 스레드에서)
+    key = request.headers.get("Idempotency-Key")
+    if not key:
+        return await save_and_recommend(request, current_user, phases)
+
+    request_fp = fingerprint(request.method, request.url.path, request.url.query, await request.body())
+    try:
+        store_key, entry = await asyncio.to_thread(acquire, current_user["user_id"], key, request_fp)
+    except IdempotencyConflict as e:
+        return json_response({"message": e.message}, e.status,
+                             {"Retry-After": e.retry_after} if e.retry_after else None)
+    if store_key is None:
+        status, mimetype, body = entry.response
+        return Response(body, status_code=status, media_type=mimetype, headers={"Idempotent-Replayed": "true"})
+
+    try:
+        response = await save_and_recommend(request, current_user, phases)
+    except Exception:
+        idempotency_store.abandon(store_key, entry)
+        raise
+    finish(store_key, entry, response.status_code, response.media_type, response.body)
+    return response
+
+
+async def save_and_recommend(request, current_user, phases):
+    # routes/survey.result 와 같은 흐름, LLM 호출만 async
+    try:
+        user_id = int(current_user["user_id"])
+        data = await request.json()
+        with phases.measure("score"):
+            subjective_result, objective_result = survey.build_survey_results(data)
+
+        async with async_sessions()() as session:
+            session.add(survey.new_survey_response(user_id, data, subjective_result, objective_result))
+            with phases.measure("commit"):
+                await session.commit()
+            user = await session.get(User, user_id)
+        schedule_refresh(flask_app)
+
+        if request.query_params.get("mode", survey.SURVEY_RESULT_MODE) == "job":
+            body, status = survey.queue_recommendation(flask_app, user_id, objective_result)
+            return json_response(body, status)
+
+        cache_key = survey.recommendation_cache_key(user, objective_result)
+        gpt_ingredients = survey.recommendation_cache.get(cache_key)
+        source = "llm"
+        if gpt_ingredients is None:
+            try:
+                with phases.measure("llm"):
+                    gpt_response = await llm_guard.acall(
+                        get_async_llm_client().chat.completions.create,
+                        **survey.llm_request(survey.build_prompt(user, objective_result))
+                    )
+                gpt_ingredients = survey.ingredients_from_answer(gpt_response.choices[0].message.content)
+                survey.recommendation_cache.set(cache_key, gpt_ingredients)
+            except LLMUnavailable as e:
+                gpt_ingredients, source = survey.fallback_recommendations(objective_result, e), "fallback"
+
+        with phases.measure("supplements"):
+            body = await asyncio.to_thread(build_result_sync, user, objective_result, gpt_ingredients, source)
+        return json_response(body)
+
+    except Exception as e:
+        return json_response({"message": "Error calculating score", "error": str(e)}, 500)
+
+
+app = Starlette(routes=[
+    Route("/survey/result", survey_result, methods=["POST"]),
+    Mount("", app=WsgiToAsgi(flask_app)),
+])
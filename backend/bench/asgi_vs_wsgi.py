@@ -0,0 +1,147 @@
+"""Compare sync (gunicorn, 1 sync worker) and async (uvicorn asgi:app) serving of POST /survey/result.
+
+Both servers run as subprocesses against the same seeded SQLite file (or --database-url) with the fake
+LLM backend sleeping FAKE_LLM_LATENCY_MS per call, so the numbers show how many submissions one process
+can keep in flight while waiting on the LLM.
+
+Run from backend/:  python -m bench.asgi_vs_wsgi --concurrency 50 200 --latency-ms 500
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+from bench.common import make_app, auth_header, summarize, temp_database_url, BACKEND_DIR
+
+SERVERS = {
+    "wsgi": lambda port: [sys.executable, "-m", "gunicorn", "app:app", "--workers", "1",
+                          "--bind", f"127.0.0.1:{port}", "--timeout", "120"],
+    "asgi": lambda port: [sys.executable, "-m", "uvicorn", "asgi:app", "--workers", "1",
+                          "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+}
+
+
+def seed(app, users):
+    from db.models import db, Account, User, Ingredient, Medicine
+    from utils.llm import SUPPLEMENT_INGREDIENTS
+
+    with app.app_context():
+        db.create_all()
+        headers = []
+        for i in range(users):
+            account = Account(email=f"survey{i}@bench.local", password_hash="-", role="환자")
+            db.session.add(account)
+            db.session.flush()
+            db.session.add(User(id=account.id, account_id=account.id, name=f"survey{i}", gender="F",
+                                occupation=f"job{i % 7}", work_style="day"))
+            headers.append(auth_header(account.id, account.email))
+        ingredients = [Ingredient(name=name) for name in SUPPLEMENT_INGREDIENTS]
+        db.session.add_all(ingredients)
+        for i in range(200):
+            db.session.add(Medicine(name=f"bench product {i}", efficacy=SUPPLEMENT_INGREDIENTS[i % 23],
+                                    ingredients=[ingredients[i % 23]]))
+        db.session.commit()
+        return headers
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(base, proc, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            urllib.request.urlopen(base + "/metrics", timeout=1)
+            return
+        except urllib.error.HTTPError:
+            return  # /metrics 는 인증이 필요함, 응답이 오면 준비된 것
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def post(url, body, headers, timeout):
+    req = urllib.request.Request(url, data=json.dumps(body).encode(), method="POST",
+                                 headers={"Content-Type": "application/json", **headers})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            r.read()
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return "error"
+
+
+def drive(base, headers, concurrency, timeout):
+    barrier = threading.Barrier(concurrency)
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    body = {"upload": True, "systolic": 125, "diastolic": 82, "fasting_glucose": 95, "bmi": 23,
+            "ast": 30, "alt": 30, "egfr": 95, "subjective_score": 70}
+
+    def client(i):
+        barrier.wait()
+        start = time.perf_counter()
+        # 프로필마다 다른 캐시 키가 되도록 약물 목록을 바꿔서 LLM 호출 유도
+        status = post(base + "/survey/result", dict(body, medications=[f"med{i}-{time.time()}"]),
+                      headers[i % len(headers)], timeout)
+        elapsed = time.perf_counter() - start
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    return {"statuses": {str(k): v for k, v in statuses.items()}, "wall_s": round(wall, 3),
+            **summarize(latencies, wall)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--latency-ms", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--database-url")
+    parser.add_argument("--modes", nargs="+", default=list(SERVERS))
+    args = parser.parse_args()
+
+    url = args.database_url or temp_database_url()
+    headers = seed(make_app(url), max(args.concurrency))
+    env = dict(os.environ, DATABASE_URL=url, LLM_BACKEND="fake", FAKE_LLM_LATENCY_MS=str(args.latency_ms),
+               CATALOG_INDEX_ON_STARTUP="1")
+
+    report = {"llm_latency_ms": args.latency_ms, "results": {}}
+    for mode in args.modes:
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        proc = subprocess.Popen(SERVERS[mode](port), cwd=BACKEND_DIR, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_ready(base, proc)
+            report["results"][mode] = {str(c): drive(base, headers, c, args.timeout) for c in args.concurrency}
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Concurrency stress test for /booking/create.
+
+Hundreds of clients book random slots of the same pharmacy on the same day at once. Every slot must
+end up with at most one booking; losers must get 409 with alternatives.
+
+Run from backend/:  python -m bench.booking_stress --clients 300
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+from bench.common import make_app, auth_header, summarize, seed_pharmacy, run_concurrent
+
+
+def seed(app, clients):
+    from db.models import db, Account, User, Pharmacist, Pharmacy, Booking
+
+    with app.app_context():
+        tables = [t.__table__ for t in (Account, User, Pharmacist, Pharmacy, Booking)]
+        db.metadata.create_all(db.engine, tables=tables)
+
+        _, (pharmacy_id,) = seed_pharmacy("pharmacist@bench.local")
+
+        headers = []
+        for i in range(clients):
+            account = Account(email=f"client{i}@bench.local", password_hash="-", role="환자")
+            db.session.add(account)
+            db.session.flush()
+            db.session.add(User(id=account.id, account_id=account.id, name=f"client{i}"))
+            headers.append(auth_header(account.id, account.email))
+        db.session.commit()
+        return pharmacy_id, headers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=4, help="number of distinct slots the clients fight over")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    pharmacy_id, headers = seed(app, args.clients)
+    day = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+    times = [f"{9 + i // 2:02d}:{30 * (i % 2):02d}" for i in range(args.slots)]
+
+    results = []
+    lock = threading.Lock()
+
+    def client(i):
+        c = app.test_client()
+        payload = {"pharmacy_id": pharmacy_id, "date": day, "time": random.choice(times)}
+        start = time.perf_counter()
+        r = c.post("/booking/create", json=payload, headers=headers[i])
+        elapsed = time.perf_counter() - start
+        with lock:
+            results.append((r.status_code, elapsed, r.get_json()))
+
+    wall = run_concurrent(args.clients, client)
+
+    from sqlalchemy import func
+    from db.models import db, Booking
+    with app.app_context():
+        duplicates = (
+            db.session.query(Booking.booked_time, func.count())
+            .filter(Booking.pharmacy_id == pharmacy_id)
+            .group_by(Booking.booked_time)
+            .having(func.count() > 1)
+            .all()
+        )
+        stored = db.session.query(Booking).filter(Booking.pharmacy_id == pharmacy_id).count()
+
+    statuses = {}
+    for status, _, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    conflicts_without_alternatives = sum(
+        1 for status, _, body in results if status == 409 and "alternatives" not in (body or {})
+    )
+
+    report = {
+        "clients": args.clients,
+        "slots": len(times),
+        "statuses": statuses,
+        "bookings_stored": stored,
+        "double_bookings": len(duplicates),
+        "conflicts_without_alternatives": conflicts_without_alternatives,
+        "latency": summarize([elapsed for _, elapsed, _ in results], wall),
+    }
+    print(json.dumps(report, indent=2))
+
+    ok = not duplicates and statuses.get(201, 0) == stored <= len(times) and set(statuses) <= {201, 409}
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
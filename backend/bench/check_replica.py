@@ -0,0 +1,90 @@
+"""Read-replica routing check with two SQLite files.
+
+The replica file starts as a copy of the primary and is never updated afterwards, so anything read
+from it is visibly stale. Checks that read-only routes go to the replica, writes go to the primary,
+and a user's reads stick to the primary for REPLICA_STICKY_SECONDS after their own write.
+
+Run from backend/:  python -m bench.check_replica
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+from datetime import date, timedelta
+from bench.common import make_app, auth_header, seed_pharmacy
+
+STICKY_SECONDS = 1
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="yakcare-replica-")
+    primary_path = os.path.join(workdir, "primary.db")
+    replica_path = os.path.join(workdir, "replica.db")
+    app = make_app("sqlite:///" + primary_path, DATABASE_REPLICA_URL="sqlite:///" + replica_path,
+                   REPLICA_STICKY_SECONDS=STICKY_SECONDS, SLOT_CACHE_TTL=0)
+
+    from db.models import db, Account, User, Booking, SurveyResponse
+    from utils.slots import slot_times
+
+    with app.app_context():
+        db.create_all()
+        _, (pharmacy_id,) = seed_pharmacy()
+        patient = Account(email="patient@bench.local", password_hash="-", role="환자")
+        db.session.add(patient)
+        db.session.flush()
+        db.session.add(User(id=patient.id, account_id=patient.id, name="patient"))
+        db.session.commit()
+        patient_id = patient.id
+        db.engines[None].dispose()
+
+    # 복제 시점 스냅샷
+    shutil.copyfile(primary_path, replica_path)
+
+    day = date.today() + timedelta(days=1)
+    slots = slot_times(day)
+    url = f"/booking/available?pharmacy_id={pharmacy_id}&date={day}"
+    headers = auth_header(patient_id, "patient@bench.local")
+
+    # 스냅샷 이후 primary 에만 있는 데이터
+    with app.app_context():
+        db.session.add(Booking(user_id=patient_id, pharmacy_id=pharmacy_id, booked_time=slots[0]))
+        db.session.add(SurveyResponse(user_id=patient_id, subjective_responses={}, objective_responses={"score": 90}))
+        db.session.commit()
+
+    def free(client):
+        return client.get(url).get_json()["available_slots"]
+
+    def replica_bookings():
+        with app.app_context():
+            return db.session.execute(db.select(db.func.count(Booking.id)), bind_arguments={"bind": db.engines["replica"]}).scalar()
+
+    def history_count(client):
+        return len(client.get("/survey/history", headers=headers).get_json()["items"])
+
+    checks = []
+    anonymous = app.test_client()
+    token_only = app.test_client(use_cookies=False)
+    checks.append(("read-only route reads the replica", "09:00" in free(anonymous)))
+    checks.append(("authenticated read-only route reads the replica", history_count(token_only) == 0))
+
+    user = app.test_client()
+    response = user.post("/booking/create", headers=headers, json={"pharmacy_id": pharmacy_id, "date": str(day), "time": "09:30"})
+    checks.append(("write goes to the primary", response.status_code == 201 and replica_bookings() == 0))
+    checks.append(("writer reads its own write (cookie)", not {"09:00", "09:30"} & set(free(user))))
+    checks.append(("other clients still read the replica", "09:30" in free(anonymous)))
+
+    checks.append(("writer's other requests stick to the primary (user id)", history_count(token_only) == 1))
+
+    time.sleep(STICKY_SECONDS + 0.2)
+    checks.append(("stickiness expires", "09:30" in free(user) and history_count(token_only) == 0))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Query-count check: GET /pharmacist/schedule must run the same number of queries for 1 booking or 1000.
+
+Seeds a pharmacist with several pharmacies, then grows the number of bookings (each with its own patient
+and surveys) and reads X-Query-Count from the response.
+
+Run from backend/:  python -m bench.check_schedule_queries
+"""
+import sys
+from datetime import date, datetime, timedelta
+from bench.common import make_app, auth_header, seed_pharmacy
+
+EXPECTED_QUERIES = 3
+SIZES = [1, 10, 100, 1000]
+
+
+def seed(app, pharmacies):
+    from db.models import db
+
+    with app.app_context():
+        db.create_all()
+        account, pharmacy_ids = seed_pharmacy("schedule@bench.local", pharmacies=pharmacies)
+        db.session.commit()
+        return auth_header(account.id, account.email), pharmacy_ids
+
+
+def add_bookings(app, pharmacy_ids, start, count, offset):
+    from db.models import db, Account, User, Booking, SurveyResponse
+    from utils.slots import slot_times
+
+    with app.app_context():
+        for n in range(offset, offset + count):
+            account = Account(email=f"patient{n}@bench.local", password_hash="-", role="환자")
+            db.session.add(account)
+            db.session.flush()
+            user = User(id=account.id, account_id=account.id, name=f"patient{n}", dob=datetime(1980, 1, 1))
+            db.session.add(user)
+            for k in range(2):
+                db.session.add(SurveyResponse(user_id=user.id, subjective_responses={},
+                                              objective_responses={"score": 80 + k, "conditions": {}},
+                                              created_at=datetime(2024, 1, 1 + k)))
+            # 약국 x 7일 x 16 슬롯에 겹치지 않게 배치
+            slot, pharmacy = divmod(n, len(pharmacy_ids))
+            day, index = divmod(slot, 16)
+            db.session.add(Booking(user_id=user.id, pharmacy_id=pharmacy_ids[pharmacy],
+                                   booked_time=slot_times(start + timedelta(days=day))[index]))
+        db.session.commit()
+
+
+def main():
+    app = make_app()
+    headers, pharmacy_ids = seed(app, pharmacies=10)
+    client = app.test_client()
+    start = date.today()
+    url = f"/pharmacist/schedule?start_date={start}&end_date={start + timedelta(days=6)}"
+
+    failures = 0
+    total = 0
+    for size in SIZES:
+        add_bookings(app, pharmacy_ids, start, size - total, total)
+        total = size
+        response = client.get(url, headers=headers)
+        body = response.get_json()
+        queries = int(response.headers["X-Query-Count"])
+        bookings = sum(len(p["bookings"]) for p in body["pharmacies"])
+        surveys_ok = all(b["latest_survey"] and b["latest_survey"]["score"] == 81
+                         for p in body["pharmacies"] for b in p["bookings"])
+        ok = response.status_code == 200 and queries == EXPECTED_QUERIES and bookings == size and surveys_ok
+        failures += not ok
+        print(f"{size:>5} bookings: status {response.status_code}, {bookings} listed, {queries} queries"
+              f"{'' if ok else '  <-- FAIL'}")
+
+    print(f"expected {EXPECTED_QUERIES} queries for every size, {failures} failures")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Golden check: table-driven scorers must match the original per-record scoring exactly.
+
+Run from backend/:  python -m bench.check_scoring
+"""
+import os
+import sys
+import json
+from utils.scoring import score_record, score_batch
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden_scores.json")
+
+
+def main():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    inputs = [case["input"] for case in golden]
+    batch = score_batch(inputs)
+
+    failures = 0
+    for i, case in enumerate(golden):
+        for name, actual in (("score_record", score_record(case["input"])), ("score_batch", batch[i])):
+            if actual != case["expected"]:
+                failures += 1
+                print(f"[{name}] case {i} mismatch: {case['input']}\n  expected {case['expected']}\n  actual   {actual}")
+
+    print(f"{len(golden)} golden cases, {failures} mismatches")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Request tracing check: Server-Timing phases, per-route phase histograms and the sampling profiler.
+
+Posts to /survey/result and /survey/result/stream with the profiler sampling every request, then checks the
+Server-Timing header, the "phases" section of /metrics and the folded stack files written to PROFILE_DIR.
+
+Run from backend/:  python -m bench.check_tracing
+"""
+import os
+import sys
+import glob
+import tempfile
+from bench.common import make_app, auth_header
+from bench.suite import seed, SURVEY_BODY
+
+RESULT_PHASES = {"auth", "score", "commit", "llm", "search", "supplements"}
+STREAM_PHASES = {"auth", "score", "commit", "llm", "supplements"}
+
+
+def header_phases(response):
+    return {entry.strip().split(";")[0] for entry in response.headers.get("Server-Timing", "").split(",") if entry.strip()}
+
+
+def main():
+    profile_dir = tempfile.mkdtemp(prefix="yakcare-profiles-")
+    app = make_app(PROFILE_SAMPLE_RATE=1, PROFILE_DIR=profile_dir, PROFILE_INTERVAL_MS=1, FAKE_LLM_LATENCY_MS=30)
+    accounts, _ = seed(app, users=2, pharmacies=1, bookings=1, medicines=200)
+    headers = auth_header(*accounts[0])
+    client = app.test_client()
+
+    from utils.metrics import metrics
+    metrics.reset()
+
+    checks = []
+    response = client.post("/survey/result", headers=headers, json=dict(SURVEY_BODY, medications=["tracing"]))
+    got = header_phases(response)
+    checks.append(("Server-Timing lists every /survey/result phase", RESULT_PHASES | {"db", "total"} <= got))
+    print("Server-Timing:", response.headers.get("Server-Timing"))
+
+    stream = client.post("/survey/result/stream", headers=headers, json=dict(SURVEY_BODY, medications=["stream"]))
+    stream.get_data()
+    checks.append(("streamed response carries the phases known before the body", {"auth", "score", "commit"} <= header_phases(stream)))
+
+    phases = metrics.snapshot()["phases"]
+    checks.append(("/survey/result phase histograms", RESULT_PHASES <= set(phases.get("POST /survey/result", {}))))
+    checks.append(("stream phases recorded after the stream ends",
+                   STREAM_PHASES <= set(phases.get("POST /survey/result/stream", {}))))
+
+    files = glob.glob(os.path.join(profile_dir, "*.folded"))
+    lines = [line for path in files for line in open(path, encoding="utf-8")]
+    checks.append(("one folded profile per request", len(files) == 2))
+    checks.append(("folded lines are `stack count`", bool(lines) and all(line.rsplit(" ", 1)[1].strip().isdigit() for line in lines)))
+    checks.append(("profile includes the view function", any("survey.py:result" in line for line in lines)))
+    for path in files:
+        print(f"{os.path.basename(path)}: {sum(int(line.rsplit(' ', 1)[1]) for line in open(path, encoding='utf-8'))} samples")
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Cold-start regression check.
+
+Starts fresh interpreters that import app.py and then build the app through the lazy `app.app`
+attribute (what gunicorn does), and reports the median of each phase plus the STARTUP breakdown.
+Fails if importing the module already built the app, or if the median cold start exceeds --budget.
+
+Run from backend/:  python -m bench.cold_start --runs 5 --budget 1.5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from statistics import median
+from bench.common import temp_database_url, BACKEND_DIR
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+eager = app.__dict__.get("_app") is not None
+app.app
+built = time.perf_counter()
+print(json.dumps({"import_seconds": imported - started, "create_seconds": built - imported,
+                  "eager": eager, "startup": app.STARTUP}))
+"""
+
+
+def run_once(env):
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=BACKEND_DIR, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_seconds"] = time.perf_counter() - started
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.5, help="max median seconds from exec to app built")
+    parser.add_argument("--database-url")
+    parser.add_argument("--no-warm-up", action="store_true")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=args.database_url or temp_database_url())
+    env.setdefault("LLM_BACKEND", "fake")
+    env.setdefault("CATALOG_INDEX_ON_STARTUP", "0")
+    env["WARMUP_ON_STARTUP"] = "0" if args.no_warm_up else "1"
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "median_process_seconds": round(median(r["process_seconds"] for r in runs), 4),
+        "median_import_seconds": round(median(r["import_seconds"] for r in runs), 4),
+        "median_create_seconds": round(median(r["create_seconds"] for r in runs), 4),
+        "eager_app": any(r["eager"] for r in runs),
+        "startup": runs[-1]["startup"],
+        "budget_seconds": args.budget,
+    }
+    print(json.dumps(report, indent=2))
+
+    if report["eager_app"]:
+        print("FAIL: importing app.py built the app", file=sys.stderr)
+        return 1
+    if report["median_process_seconds"] > args.budget:
+        print(f"FAIL: cold start {report['median_process_seconds']}s over budget {args.budget}s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
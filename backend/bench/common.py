@@ -0,0 +1,94 @@
+import os
+import sys
+import math
+import time
+import tempfile
+import threading
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def temp_database_url():
+    return "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="yakcare-bench-"), "bench.db")
+
+
+def make_app(database_url=None, **env):
+    """Build the real app against a throwaway SQLite file (or the given URL) with the fake LLM."""
+    url = database_url or temp_database_url()
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ.setdefault("CATALOG_INDEX_ON_STARTUP", "0")
+    for key, value in env.items():
+        os.environ[key] = str(value)
+
+    from app import create_app
+    return create_app()
+
+
+def seed_pharmacy(email="owner@bench.local", pharmacies=1, name="bench"):
+    """Owner account (약사) -> Pharmacist -> pharmacies; call inside an app context, the caller commits.
+
+    Returns (owner account, pharmacy ids).
+    """
+    from sqlalchemy import insert
+    from db.models import db, Account, Pharmacist, Pharmacy
+
+    owner = Account(email=email, password_hash="-", role="약사")
+    db.session.add(owner)
+    db.session.flush()
+    pharmacist = Pharmacist(account_id=owner.id, name=name)
+    db.session.add(pharmacist)
+    db.session.flush()
+    pharmacy_ids = db.session.execute(
+        insert(Pharmacy).returning(Pharmacy.id),
+        [{"pharmacist_id": pharmacist.id, "name": name if pharmacies == 1 else f"pharmacy{i}", "address": f"address {i}"}
+         for i in range(pharmacies)],
+    ).scalars().all()
+    return owner, pharmacy_ids
+
+
+def run_concurrent(workers, fn):
+    """Run fn(i) on `workers` threads released together by a barrier; returns the wall time in seconds."""
+    barrier = threading.Barrier(workers)
+
+    def run(i):
+        barrier.wait()
+        fn(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started
+
+
+def auth_header(account_id, email):
+    from utils.security import generate_jwt
+    return {"Authorization": "Bearer " + generate_jwt({"email": email, "user_id": account_id})}
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[k]
+
+
+def summarize(latencies, elapsed=None):
+    """Latency list in seconds -> summary in milliseconds (+ throughput if elapsed is given)."""
+    summary = {
+        "requests": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(latencies) / elapsed, 2)
+    return summary
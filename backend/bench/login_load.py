@@ -0,0 +1,101 @@
+"""Login load test: hashing inline (HASH_WORKERS=0) vs in the process pool.
+
+While login clients hammer /auth/login, a probe client keeps calling /booking/available and
+records how much other routes slow down.
+
+Run from backend/:  python -m bench.login_load --clients 16 --duration 10
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from bench.common import make_app, summarize, seed_pharmacy, run_concurrent
+
+PASSWORD = "bench-password"
+
+
+def seed(app, accounts):
+    from db.models import db, Account, User, Pharmacist, Pharmacy, Booking
+    from werkzeug.security import generate_password_hash
+    from utils.hashing import PASSWORD_HASH_METHOD
+
+    with app.app_context():
+        tables = [t.__table__ for t in (Account, User, Pharmacist, Pharmacy, Booking)]
+        db.metadata.create_all(db.engine, tables=tables)
+        password_hash = generate_password_hash(PASSWORD, method=PASSWORD_HASH_METHOD)
+        for i in range(accounts):
+            db.session.add(Account(email=f"login{i}@bench.local", password_hash=password_hash, role="환자"))
+        _, (pharmacy_id,) = seed_pharmacy()
+        db.session.commit()
+        return pharmacy_id
+
+
+def run_mode(args):
+    app = make_app(args.database_url)
+    pharmacy_id = seed(app, args.clients)
+    deadline = time.perf_counter() + args.duration
+    login_latencies, probe_latencies, statuses = [], [], {}
+    lock = threading.Lock()
+
+    def login_client(i):
+        c = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            r = c.post("/auth/login", json={"email": f"login{i}@bench.local", "password": PASSWORD})
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code == 200:
+                    login_latencies.append(elapsed)
+
+    def probe_client():
+        c = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            c.get(f"/booking/available?pharmacy_id={pharmacy_id}")
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+
+    # 마지막 스레드는 다른 라우트 지연을 재는 probe
+    wall = run_concurrent(args.clients + 1, lambda i: login_client(i) if i < args.clients else probe_client())
+
+    return {
+        "hash_workers": int(os.getenv("HASH_WORKERS", 2)),
+        "login_statuses": statuses,
+        "login": summarize(login_latencies, wall),
+        "other_endpoint": summarize(probe_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--database-url")
+    parser.add_argument("--single", action="store_true", help="run one mode with the current environment")
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_mode(args)))
+        return 0
+
+    report = {}
+    for label, workers in (("before_inline", 0), ("after_pool", args.workers)):
+        env = dict(os.environ, HASH_WORKERS=str(workers))
+        cmd = [sys.executable, "-m", "bench.login_load", "--single",
+               "--clients", str(args.clients), "--duration", str(args.duration)]
+        if args.database_url:
+            cmd += ["--database-url", args.database_url]
+        out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True).stdout
+        report[label] = json.loads(out.strip().splitlines()[-1])
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
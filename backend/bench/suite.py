@@ -0,0 +1,250 @@
+"""Offline benchmark suite for the auth, booking and survey endpoints.
+
+Starts create_app() against a throwaway SQLite file (or --database-url) seeded with synthetic accounts,
+pharmacies, bookings and a medicine catalog, with the fake LLM backend in place of OpenAI. Each scenario
+runs at every --concurrency level; throughput, p50/p95/p99 latency and per-request query counts
+(X-Query-Count) are written to a JSON report.
+
+Run from backend/ (baselines are machine-specific, so bench/baseline.json is not committed):
+    python -m bench.suite --write-baseline              # record bench/baseline.json on this machine
+    python -m bench.suite --compare bench/baseline.json # exit 1 on regressions, 2 if there is no baseline
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+from datetime import date, datetime, timedelta
+from bench.common import make_app, auth_header, summarize, seed_pharmacy, run_concurrent, BACKEND_DIR
+
+PASSWORD = "bench-password"
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "bench", "baseline.json")
+SURVEY_BODY = {"upload": True, "systolic": 125, "diastolic": 82, "fasting_glucose": 95, "bmi": 23,
+               "ast": 30, "alt": 30, "egfr": 95, "subjective_score": 70}
+
+
+def seed(app, users, pharmacies, bookings, medicines):
+    from sqlalchemy import insert
+    from db.models import db, Account, User, Booking, Ingredient, Medicine, MedicineIngredient
+    from werkzeug.security import generate_password_hash
+    from utils.hashing import PASSWORD_HASH_METHOD
+    from utils.llm import SUPPLEMENT_INGREDIENTS
+    from utils.slots import slot_times
+
+    rng = random.Random(16)
+    with app.app_context():
+        db.create_all()
+        password_hash = generate_password_hash(PASSWORD, method=PASSWORD_HASH_METHOD)
+
+        account_ids = db.session.execute(
+            insert(Account).returning(Account.id),
+            [{"email": f"user{i}@bench.local", "password_hash": password_hash, "role": "환자"} for i in range(users)],
+        ).scalars().all()
+        db.session.execute(insert(User), [
+            {"id": account_id, "account_id": account_id, "name": f"user{i}", "gender": "FM"[i % 2],
+             "dob": datetime(1960 + i % 40, 1 + i % 12, 1), "occupation": f"job{i % 7}", "work_style": "day"}
+            for i, account_id in enumerate(account_ids)
+        ])
+
+        _, pharmacy_ids = seed_pharmacy(pharmacies=pharmacies)
+
+        # 과거/미래 예약을 섞어서 슬롯 조회가 실제 데이터를 읽게 함
+        taken = set()
+        rows = []
+        while len(rows) < bookings:
+            day = date.today() + timedelta(days=rng.randint(-14, 14))
+            key = (rng.choice(pharmacy_ids), rng.choice(slot_times(day)))
+            if key in taken:
+                continue
+            taken.add(key)
+            rows.append({"user_id": rng.choice(account_ids), "pharmacy_id": key[0], "booked_time": key[1], "comment": ""})
+        db.session.execute(insert(Booking), rows)
+
+        ingredient_ids = db.session.execute(
+            insert(Ingredient).returning(Ingredient.id), [{"name": name} for name in SUPPLEMENT_INGREDIENTS]
+        ).scalars().all()
+        medicine_ids = db.session.execute(insert(Medicine).returning(Medicine.id), [
+            {"name": f"bench product {i}", "manufacturer": f"maker{i % 50}", "price": str(1000 + i % 90 * 100),
+             "efficacy": f"{SUPPLEMENT_INGREDIENTS[i % 23]} 함유 건강 효능"}
+            for i in range(medicines)
+        ]).scalars().all()
+        db.session.execute(insert(MedicineIngredient), [
+            {"medicine_id": medicine_id, "ingredient_id": ingredient_ids[(i + k * 5) % 23]}
+            for i, medicine_id in enumerate(medicine_ids) for k in range(2)
+        ])
+        db.session.commit()
+        return [(account_id, f"user{i}@bench.local") for i, account_id in enumerate(account_ids)], pharmacy_ids
+
+
+def make_scenarios(accounts, pharmacy_ids):
+    headers = [auth_header(account_id, email) for account_id, email in accounts]
+    counter = iter(range(10 ** 9))
+
+    def auth_login(c, rng):
+        _, email = rng.choice(accounts)
+        return c.post("/auth/login", json={"email": email, "password": PASSWORD})
+
+    def auth_signup(c, rng):
+        n = next(counter)
+        return c.post("/auth/signup", json={"email": f"signup{n}-{time.time_ns()}@bench.local", "password": PASSWORD,
+                                            "name": f"signup{n}", "dob": "1990-01-01", "gender": "F",
+                                            "occupation": "job0", "work_style": "day"})
+
+    def booking_available(c, rng):
+        day = (date.today() + timedelta(days=rng.randint(0, 7))).strftime("%Y-%m-%d")
+        return c.get(f"/booking/available?pharmacy_id={rng.choice(pharmacy_ids)}&date={day}")
+
+    def booking_available_range(c, rng):
+        ids = ",".join(str(i) for i in rng.sample(pharmacy_ids, min(10, len(pharmacy_ids))))
+        start = date.today()
+        return c.get(f"/booking/available?pharmacy_ids={ids}&start_date={start}&end_date={start + timedelta(days=6)}")
+
+    def booking_create(c, rng):
+        day = (date.today() + timedelta(days=rng.randint(15, 60))).strftime("%Y-%m-%d")
+        slot = rng.randrange(16)
+        return c.post("/booking/create", headers=rng.choice(headers), json={
+            "pharmacy_id": rng.choice(pharmacy_ids), "date": day,
+            "time": f"{9 + slot // 2:02d}:{30 * (slot % 2):02d}",
+        })
+
+    def survey_result(c, rng):
+        # 매번 다른 약물 목록 -> 추천 캐시 미스로 LLM 경로까지 측정
+        body = dict(SURVEY_BODY, systolic=rng.randint(100, 170), medications=[f"med{rng.random()}"])
+        return c.post("/survey/result", headers=rng.choice(headers), json=body)
+
+    return {
+        "auth_login": (auth_login, (200,)),
+        "auth_signup": (auth_signup, (201,)),
+        "booking_available": (booking_available, (200,)),
+        "booking_available_range": (booking_available_range, (200,)),
+        "booking_create": (booking_create, (201, 409)),
+        "survey_result": (survey_result, (200,)),
+    }
+
+
+def run_scenario(app, name, fn, expected, concurrency, requests):
+    latencies, queries, statuses = [], [], {}
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def worker(n):
+        c = app.test_client()
+        # 시나리오/동시성/워커마다 다른 시드: 단계마다 같은 약물 목록을 다시 보내면 추천 캐시가 맞아버림
+        rng = random.Random(f"{name}:{concurrency}:{n}")
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            r = fn(c, rng)
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                latencies.append(elapsed)
+                queries.append(int(r.headers.get("X-Query-Count", 0)))
+
+    wall = run_concurrent(concurrency, worker)
+
+    result = summarize(latencies, wall)
+    result["queries_mean"] = round(sum(queries) / len(queries), 2) if queries else 0.0
+    result["queries_max"] = max(queries) if queries else 0
+    result["statuses"] = {str(k): v for k, v in sorted(statuses.items())}
+    result["unexpected"] = sum(v for k, v in statuses.items() if k not in expected)
+    return result
+
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    """Regressions: p95 or throughput worse than tolerance, more queries, or new unexpected statuses."""
+    regressions = []
+    for name, levels in baseline["results"].items():
+        for level, base in levels.items():
+            current = report["results"].get(name, {}).get(level)
+            if current is None:
+                continue
+            where = f"{name}@{level}"
+            if current["p95_ms"] > max(base["p95_ms"] * (1 + tolerance), base["p95_ms"] + min_delta_ms):
+                regressions.append(f"{where}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+            if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+                regressions.append(f"{where}: throughput {base['throughput_rps']} -> {current['throughput_rps']} rps")
+            if current["queries_max"] > base["queries_max"]:
+                regressions.append(f"{where}: queries/request {base['queries_max']} -> {current['queries_max']}")
+            if current["unexpected"] > base["unexpected"]:
+                regressions.append(f"{where}: unexpected statuses {current['statuses']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", nargs="+", help="subset of scenarios to run")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--pharmacies", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--medicines", type=int, default=20000)
+    parser.add_argument("--database-url")
+    parser.add_argument("--output", help="write the report here")
+    parser.add_argument("--write-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95/throughput change")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore p95 changes smaller than this")
+    args = parser.parse_args()
+
+    # 기준선은 머신마다 달라서 저장소에 넣지 않음: 같은 머신에서 먼저 --write-baseline
+    if args.compare and not os.path.exists(args.compare):
+        print(f"Baseline {args.compare} not found. Record one on this machine first:\n"
+              f"  python -m bench.suite --write-baseline {args.compare}\n"
+              f"then re-run with --compare {args.compare} after your change.", file=sys.stderr)
+        return 2
+
+    # LLM 지연은 고정, 집계 백그라운드 작업과 쿼리 예산 경고는 끔
+    app = make_app(args.database_url, FAKE_LLM_LATENCY_MS=os.getenv("FAKE_LLM_LATENCY_MS", "50"),
+                   ANALYTICS_AUTO_REFRESH="0", QUERY_BUDGET="1000")
+    started = time.perf_counter()
+    accounts, pharmacy_ids = seed(app, args.users, args.pharmacies, args.bookings, args.medicines)
+    seed_seconds = round(time.perf_counter() - started, 2)
+
+    scenarios = make_scenarios(accounts, pharmacy_ids)
+    names = args.scenarios or list(scenarios)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+            "seed": {"users": args.users, "pharmacies": args.pharmacies, "bookings": args.bookings,
+                     "medicines": args.medicines, "seconds": seed_seconds},
+            "requests": args.requests,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+    for name in names:
+        fn, expected = scenarios[name]
+        fn(app.test_client(), random.Random(f"{name}:warm-up"))  # 워밍업 (캐시/인덱스 빌드)
+        for concurrency in args.concurrency:
+            result = run_scenario(app, name, fn, expected, concurrency, args.requests)
+            report["results"].setdefault(name, {})[str(concurrency)] = result
+            print(f"{name:<24} c={concurrency:<3} {result['throughput_rps']:>8} rps  "
+                  f"p50 {result['p50_ms']:>8}ms  p95 {result['p95_ms']:>8}ms  p99 {result['p99_ms']:>8}ms  "
+                  f"queries {result['queries_mean']}/{result['queries_max']}  {result['statuses']}", file=sys.stderr)
+
+    for path in filter(None, (args.output, args.write_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_delta_ms)
+        print(json.dumps({"regressions": regressions}, indent=2, ensure_ascii=False))
+        return 1 if regressions else 0
+
+    if not args.output and not args.write_baseline:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Micro-benchmark: JWT verification cost with and without the verified-token cache.
+
+Run from backend/:  python -m bench.token_cache --iterations 20000
+"""
+import json
+import time
+import argparse
+import bench.common  # noqa: F401  (backend/ on sys.path)
+from utils.security import generate_jwt, decode_token, token_cache
+
+
+def run(token, iterations, use_cache):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_token(token, use_cache=use_cache)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = generate_jwt({"email": "bench@local", "user_id": 1})
+    token_cache.clear()
+    decode_token(token)  # warm
+
+    uncached = run(token, args.iterations, use_cache=False)
+    cached = run(token, args.iterations, use_cache=True)
+    print(json.dumps({
+        "iterations": args.iterations,
+        "uncached_us": round(uncached * 1e6, 2),
+        "cached_us": round(cached * 1e6, 2),
+        "speedup": round(uncached / cached, 1) if cached else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import json
+import click
+from utils.bulk_import import import_users, read_rows, detect_format
+from utils.catalog_loader import CatalogLoader, read_catalog, detect_catalog_format
+from utils import analytics
+from utils.geo import geocode_pharmacies, read_geocode_table
+from db import migrations
+
+
+def register_commands(app):
+    @app.cli.command("upgrade-db")
+    def upgrade_db_command():
+        """Create missing tables and apply schema changes to an existing database (safe to re-run)."""
+        migrations.upgrade(echo=click.echo)
+
+    @app.cli.command("import-users")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Defaults to the file extension.")
+    @click.option("--chunk-size", default=1000, show_default=True)
+    def import_users_command(path, fmt, chunk_size):
+        """Bulk import accounts/users from a CSV or JSONL file."""
+        def progress(report):
+            click.echo(f"{report.total} rows read, {report.created} created, {report.error_count} errors", err=True)
+
+        with open(path, "rb") as f:
+            report = import_users(read_rows(f, fmt or detect_format(path)), chunk_size=chunk_size, progress=progress)
+        click.echo(json.dumps(report, ensure_ascii=False, indent=2))
+
+    @app.cli.command("load-catalog")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["csv", "jsonl", "json"]), help="Defaults to the file extension.")
+    @click.option("--chunk-size", default=2000, show_default=True)
+    def load_catalog_command(path, fmt, chunk_size):
+        """Stream a medicine catalog (CSV/JSONL/JSON) into medicines, ingredients and their links."""
+        def progress(report):
+            click.echo(f"{report['rows']} rows, {report['rows_per_second']} rows/s "
+                       f"(+{report['inserted']} ~{report['updated']} ={report['unchanged']})", err=True)
+
+        loader = CatalogLoader(chunk_size=chunk_size, progress=progress)
+        with open(path, "rb") as f:
+            report = loader.load(read_catalog(f, fmt or detect_catalog_format(path)))
+        click.echo(json.dumps(report, ensure_ascii=False, indent=2))
+
+    @app.cli.command("analytics-refresh")
+    @click.option("--batch-size", default=500, show_default=True)
+    def analytics_refresh_command(batch_size):
+        """Fold new survey responses into the analytics rollups."""
+        click.echo(f"{analytics.refresh(batch_size=batch_size)} survey responses processed")
+
+    @app.cli.command("analytics-rebuild")
+    @click.option("--check", is_flag=True, help="Only compare the rollups with a full scan.")
+    def analytics_rebuild_command(check):
+        """Rebuild the analytics rollups from a full scan of survey_responses."""
+        if check:
+            diffs = analytics.check()
+            click.echo(json.dumps({"differences": len(diffs), "samples": diffs[:50]}, ensure_ascii=False, indent=2))
+            if diffs:
+                raise SystemExit(1)
+            return
+        click.echo(json.dumps(analytics.rebuild(), ensure_ascii=False))
+
+    @app.cli.command("geocode-pharmacies")
+    @click.argument("lookup", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--overwrite", is_flag=True, help="Also re-geocode pharmacies that already have coordinates.")
+    def geocode_pharmacies_command(lookup, overwrite):
+        """Fill pharmacy coordinates from a local CSV lookup table (address, latitude, longitude)."""
+        with open(lookup, "rb") as f:
+            table = read_geocode_table(f)
+        click.echo(json.dumps(geocode_pharmacies(table, overwrite=overwrite), ensure_ascii=False, indent=2))
@@ -1,25 +1,27 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
-from dotenv import load_dotenv
 import os
 
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def engine_options(database_url):
+    # Flask-SQLAlchemy 엔진 하나만 사용 (SQLALCHEMY_ENGINE_OPTIONS)
+    options = {
+        "echo": os.getenv("DB_ECHO") == "1",
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+    if database_url and not database_url.startswith("sqlite"):
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", 30)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        )
+    return options
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Base class for models
-Base = declarative_base()
 
 def get_connection():
+    # app context 안에서 호출
+    from db.models import db
     try:
-        with engine.connect() as conn:
+        with db.engine.connect() as conn:
             print("Successful connection to DB")
     except Exception as ex:
         print("Connection error:", ex)
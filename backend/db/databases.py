@@ -1,7 +1,7 @@
-from db import Base, engine
-from db import models
+from db.models import db
 
 def create_tables():
-    # Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    print("All tables created!")
\ No newline at end of file
+    # app context 안에서 호출
+    # db.drop_all()
+    db.create_all()
+    print("All tables created!")
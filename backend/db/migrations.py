@@ -0,0 +1,187 @@
+"""Schema upgrades for databases created before a column or constraint was added to db/models.py.
+
+db.create_all() only creates missing tables, it never alters existing ones. Each step checks the live
+schema first, so `flask upgrade-db` is safe to re-run; run it once per deploy before starting the workers.
+"""
+import hashlib
+from sqlalchemy import inspect, text, select, update
+from db.models import db, Medicine
+
+STEPS = []
+
+
+def step(fn):
+    STEPS.append(fn)
+    return fn
+
+
+def upgrade(echo=print):
+    db.create_all()
+    results = {}
+    for fn in STEPS:
+        results[fn.__name__] = fn()
+        echo(f"{fn.__name__}: {results[fn.__name__]}")
+    return results
+
+
+def dialect():
+    return db.engine.dialect.name
+
+
+def has_unique(table, name, columns):
+    inspector = inspect(db.engine)
+    for item in inspector.get_unique_constraints(table) + [i for i in inspector.get_indexes(table) if i.get("unique")]:
+        if item.get("name") == name or item.get("column_names") == columns:
+            return True
+    return False
+
+
+def has_column(table, column):
+    return column in {c["name"] for c in inspect(db.engine).get_columns(table)}
+
+
+def add_columns(table, columns):
+    # columns: [(이름, 타입 DDL)], 이미 있는 컬럼은 건너뜀
+    added = [(name, ddl) for name, ddl in columns if not has_column(table, name)]
+    with db.engine.begin() as conn:
+        for name, ddl in added:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+    return [name for name, _ in added]
+
+
+@step
+def booking_unique_slot():
+    # POST /booking/create 의 ON CONFLICT (pharmacy_id, booked_time) 에 필요한 제약
+    if has_unique("booking", "uq_booking_pharmacy_time", ["pharmacy_id", "booked_time"]):
+        return "already applied"
+
+    with db.engine.begin() as conn:
+        if dialect() == "postgresql":
+            # 중복 정리와 제약 추가 사이에 새 중복 예약이 들어오지 않게
+            conn.execute(text("LOCK TABLE booking IN SHARE ROW EXCLUSIVE MODE"))
+        # 같은 약국/시간 중복은 먼저 들어온(id 가 가장 작은) 예약만 남김
+        deleted = conn.execute(text(
+            "DELETE FROM booking WHERE id NOT IN "
+            "(SELECT MIN(id) FROM booking GROUP BY pharmacy_id, booked_time)"
+        )).rowcount
+        if dialect() == "postgresql":
+            conn.execute(text(
+                "ALTER TABLE booking ADD CONSTRAINT uq_booking_pharmacy_time UNIQUE (pharmacy_id, booked_time)"
+            ))
+        else:
+            # SQLite 는 ALTER TABLE ADD CONSTRAINT 가 없음 (유니크 인덱스로 ON CONFLICT 대상이 됨)
+            conn.execute(text(
+                "CREATE UNIQUE INDEX uq_booking_pharmacy_time ON booking (pharmacy_id, booked_time)"
+            ))
+    return f"removed {deleted} duplicate bookings, added uq_booking_pharmacy_time"
+
+
+def drop_invalid_indexes(conn, names):
+    # 중단된 CONCURRENTLY 빌드가 남긴 INVALID 인덱스는 지우고 다시 만듦 (postgresql, AUTOCOMMIT 연결)
+    invalid = conn.execute(text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+    ), {"names": names}).scalars().all()
+    for name in invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+# GIN 인덱스는 CREATE INDEX CONCURRENTLY 로 (빌드 중에도 medicines/ingredients 쓰기 가능)
+SEARCH_INDEXES = {
+    "ix_medicines_name_trgm": "medicines USING gin (name gin_trgm_ops)",
+    "ix_medicines_efficacy_trgm": "medicines USING gin (efficacy gin_trgm_ops)",
+    "ix_ingredients_name_trgm": "ingredients USING gin (name gin_trgm_ops)",
+    "ix_medicines_search_tsv": "medicines USING gin "
+                               "(to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(efficacy, '')))",
+    "ix_medicines_ingredients_ingredient_id": "medicines_ingredients (ingredient_id)",
+    "ix_medicines_ingredients_medicine_id": "medicines_ingredients (medicine_id)",
+}
+
+
+@step
+def search_indexes():
+    # 검색은 인덱스 없이도 동작함 (느릴 뿐), SQLite 는 프로세스 내 인덱스 사용
+    if dialect() != "postgresql":
+        return "skipped (not postgresql)"
+
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            trigram = True
+        except Exception as e:
+            print("pg_trgm unavailable, skipping trigram indexes:", e)
+            trigram = False
+
+        drop_invalid_indexes(conn, list(SEARCH_INDEXES))
+        created = []
+        for name, definition in SEARCH_INDEXES.items():
+            if "gin_trgm_ops" in definition and not trigram:
+                continue
+            conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
+            created.append(name)
+    return f"ensured {', '.join(created)}"
+
+
+def medicine_name_key(name, manufacturer):
+    # utils/catalog_loader.normalize 의 코드 없는 행 키와 같은 값
+    return "nm:" + hashlib.sha1(f"{(name or '').strip()}|{(manufacturer or '').strip()}".encode("utf-8")).hexdigest()
+
+
+@step
+def medicine_catalog_columns(batch_size=5000):
+    added = add_columns("medicines", [("code", "VARCHAR(255)"), ("content_hash", "VARCHAR(40)")])
+    # create_all 로 만든 테이블은 모델의 unique=True 제약이 이미 있음
+    if not has_unique("medicines", "uq_medicines_code", ["code"]):
+        with db.engine.begin() as conn:
+            conn.execute(text("CREATE UNIQUE INDEX uq_medicines_code ON medicines (code)"))
+
+    # 기존 행에 이름+제조사 키를 채워서 첫 load-catalog 가 중복 insert 대신 upsert 하게 함
+    taken = set(db.session.execute(select(Medicine.code).where(Medicine.code.is_not(None))).scalars())
+    backfilled = duplicates = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(Medicine.id, Medicine.name, Medicine.manufacturer)
+            .where(Medicine.code.is_(None), Medicine.id > last_id)
+            .order_by(Medicine.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        values = []
+        for row in rows:
+            code = medicine_name_key(row.name, row.manufacturer)
+            if code in taken:
+                duplicates += 1  # 같은 이름+제조사 중복 행은 id 가 가장 작은 행만 키를 가짐
+                continue
+            taken.add(code)
+            values.append({"id": row.id, "code": code})
+        if values:
+            db.session.execute(update(Medicine), values)
+        db.session.commit()
+        backfilled += len(values)
+        last_id = rows[-1].id
+    return f"added columns {added or 'none'}, backfilled {backfilled} codes, {duplicates} duplicate rows left without a code"
+
+
+@step
+def pharmacy_coordinates():
+    # flask geocode-pharmacies 로 채우는 좌표 (WGS84)
+    added = add_columns("pharmacies", [("latitude", "FLOAT"), ("longitude", "FLOAT")])
+    return f"added columns {added}" if added else "already applied"
+
+
+@step
+def survey_history_index():
+    # GET /survey/history 의 keyset pagination (user_id, created_at, id)
+    name = "ix_survey_responses_user_created"
+    definition = "survey_responses (user_id, created_at, id)"
+    if dialect() != "postgresql":
+        with db.engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+        return f"ensured {name}"
+
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        drop_invalid_indexes(conn, [name])
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
+    return f"ensured {name}"
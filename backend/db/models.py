@@ -1,9 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from db import Base
 from sqlalchemy.dialects.postgresql import JSONB
+from db.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# Postgres 에서는 JSONB, 그 외(SQLite 등 로컬/벤치마크)에서는 일반 JSON
+JSONType = db.JSON().with_variant(JSONB(), "postgresql")
 
 class Account(db.Model):
     __tablename__ = "accounts"
@@ -62,6 +65,9 @@ class Pharmacy(db.Model):
     pharmacist_id = db.Column(db.Integer, db.ForeignKey("pharmacists.id"), nullable=False)
     name = db.Column(db.String(100))
     address = db.Column(db.String(255))
+    # flask geocode-pharmacies 로 채움 (WGS84)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
 
     pharmacist = db.relationship("Pharmacist", back_populates="pharmacies")
     bookings = db.relationship("Booking", back_populates="pharmacy", lazy=True)
@@ -72,6 +78,10 @@ class Pharmacy(db.Model):
 
 class Booking(db.Model):
     __tablename__ = "booking"
+    __table_args__ = (
+        # 한 약국의 같은 시간대는 한 건만 (availability 범위 조회 인덱스 겸용)
+        db.UniqueConstraint("pharmacy_id", "booked_time", name="uq_booking_pharmacy_time"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -89,22 +99,50 @@ class Booking(db.Model):
 
 class SurveyResponse(db.Model):
     __tablename__ = "survey_responses"
+    __table_args__ = (
+        # 사용자별 최신순 이력 조회 (keyset pagination)
+        db.Index("ix_survey_responses_user_created", "user_id", "created_at", "id"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
-    objective_responses = db.Column(JSONB, nullable=False)
-    subjective_responses = db.Column(JSONB, nullable=False)
+    objective_responses = db.Column(JSONType, nullable=False)
+    subjective_responses = db.Column(JSONType, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     user = db.relationship("User", back_populates="survey_responses")
+    vitals = db.relationship("SurveyVitals", back_populates="survey_response", uselist=False)
 
     def __repr__(self):
         return f"<SurveyResponse {self.id} - User {self.user_id}>"
 
+
+# 건강검진 업로드 원본 수치 (추이 조회용, 설문 1건당 1행)
+class SurveyVitals(db.Model):
+    __tablename__ = "survey_vitals"
+    __table_args__ = (
+        db.Index("ix_survey_vitals_user_created", "user_id", "created_at"),
+    )
+
+    survey_id = db.Column(db.Integer, db.ForeignKey("survey_responses.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    systolic = db.Column(db.Float)
+    diastolic = db.Column(db.Float)
+    fasting_glucose = db.Column(db.Float)
+    bmi = db.Column(db.Float)
+    ast = db.Column(db.Float)
+    alt = db.Column(db.Float)
+    egfr = db.Column(db.Float)
+
+    survey_response = db.relationship("SurveyResponse", back_populates="vitals")
+
 class Medicine(db.Model):
     __tablename__ = 'medicines'
 
     id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(255), unique=True, nullable=True)  # 카탈로그 제품 코드 (적재 시 upsert 키)
+    content_hash = db.Column(db.String(40), nullable=True)  # 변경된 행만 다시 적재
     name = db.Column(db.String(255), nullable=False)
     manufacturer = db.Column(db.String(255), nullable=True)
     price = db.Column(db.String(255), nullable=True)
@@ -135,7 +173,47 @@ class Ingredient(db.Model):
 
 class MedicineIngredient(db.Model):
     __tablename__ = 'medicines_ingredients'
+    __table_args__ = (
+        db.UniqueConstraint('medicine_id', 'ingredient_id', name='uq_medicine_ingredient'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    medicine_id = db.Column(db.Integer, db.ForeignKey('medicines.id'), nullable=False)
-    ingredient_id = db.Column(db.Integer, db.ForeignKey('ingredients.id'), nullable=False)
+    medicine_id = db.Column(db.Integer, db.ForeignKey('medicines.id'), nullable=False, index=True)
+    ingredient_id = db.Column(db.Integer, db.ForeignKey('ingredients.id'), nullable=False, index=True)
+
+
+# 통계 집계 테이블 (utils/analytics.py 에서 survey_responses 를 증분 반영)
+class AnalyticsUserState(db.Model):
+    __tablename__ = "analytics_user_state"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    survey_id = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float)
+    occupation = db.Column(db.String(150))
+    work_style = db.Column(db.String(150))
+    conditions = db.Column(JSONType)
+
+
+class AnalyticsConditionCount(db.Model):
+    __tablename__ = "analytics_condition_counts"
+
+    metric = db.Column(db.String(50), primary_key=True)
+    level = db.Column(db.String(20), primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AnalyticsScoreBucket(db.Model):
+    __tablename__ = "analytics_score_buckets"
+
+    dimension = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.String(150), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+
+
+class AnalyticsWatermark(db.Model):
+    __tablename__ = "analytics_watermark"
+
+    name = db.Column(db.String(50), primary_key=True)
+    last_survey_id = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,143 @@
+import os
+import time
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from collections import OrderedDict
+from flask import g, request, has_app_context, has_request_context
+from sqlalchemy import event
+from flask_sqlalchemy.session import Session
+
+# DATABASE_REPLICA_URL 이 있으면 읽기 전용 라우트/쿼리는 replica, 쓰기는 primary
+REPLICA_BIND = "replica"
+STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", 5))
+STICKY_COOKIE = "read_primary_until"
+
+
+class StickyUsers:
+    """user_id -> time until which that user's reads stay on the primary (after their own write)."""
+
+    def __init__(self, seconds=5, maxsize=100000):
+        self.seconds = seconds
+        self.maxsize = maxsize
+        self.until = OrderedDict()
+        self.lock = threading.Lock()
+
+    def mark(self, user_id):
+        with self.lock:
+            self.until[user_id] = time.time() + self.seconds
+            self.until.move_to_end(user_id)
+            while len(self.until) > self.maxsize:
+                self.until.popitem(last=False)
+
+    def active(self, user_id):
+        if user_id is None:
+            return False
+        with self.lock:
+            until = self.until.get(user_id)
+            if until is not None and until < time.time():
+                del self.until[user_id]
+                return False
+            return until is not None
+
+
+sticky_users = StickyUsers(seconds=STICKY_SECONDS)
+
+
+def is_sticky():
+    # 이번 요청에서 쓴 경우, 쿠키(다른 워커에서 쓴 경우), 같은 워커의 사용자별 기록
+    return (
+        g.get("db_wrote", False)
+        or g.get("db_sticky_until", 0) > time.time()
+        or sticky_users.active(g.get("user_id"))
+    )
+
+
+class RoutingSession(Session):
+    """db.session that sends SELECTs to the replica bind inside @read_replica / replica_reads()."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.use_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def use_replica(self, clause):
+        if not has_app_context() or not (g.get("db_read_replica") or g.get("db_force_replica")):
+            return False
+        if self._flushing or self.info.get("wrote"):
+            return False
+        if clause is not None and not getattr(clause, "is_select", False):
+            return False
+        if not g.get("db_force_replica") and is_sticky():
+            return False
+        return REPLICA_BIND in self._db.engines
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_sticky(session):
+    if session.info.pop("wrote", False) and has_app_context():
+        g.db_wrote = True
+        user_id = g.get("user_id")
+        if user_id is not None:
+            sticky_users.mark(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _clear_wrote(session):
+    session.info.pop("wrote", None)
+
+
+def read_replica(f):
+    # 읽기 전용 라우트에 붙임 (사용자가 방금 쓴 경우에는 primary)
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        previous = g.get("db_read_replica", False)
+        g.db_read_replica = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.db_read_replica = previous
+
+    return decorated
+
+
+@contextmanager
+def replica_reads():
+    # 사용자가 쓰지 않는 데이터(카탈로그 등) 조회는 stickiness 와 관계없이 replica
+    previous = g.get("db_force_replica", False)
+    g.db_force_replica = True
+    try:
+        yield
+    finally:
+        g.db_force_replica = previous
+
+
+def replica_binds(replica_url, options):
+    return {REPLICA_BIND: {"url": replica_url, **options}} if replica_url else {}
+
+
+def init_read_replica(app):
+    @app.before_request
+    def read_sticky_cookie():
+        try:
+            g.db_sticky_until = float(request.cookies.get(STICKY_COOKIE, 0))
+        except ValueError:
+            g.db_sticky_until = 0
+
+    @app.after_request
+    def set_sticky_cookie(response):
+        if has_request_context() and g.get("db_wrote"):
+            response.set_cookie(STICKY_COOKIE, f"{time.time() + STICKY_SECONDS:.3f}",
+                                max_age=int(STICKY_SECONDS) + 1, httponly=True, samesite="Lax")
+        return response
@@ -1,8 +1,18 @@
 from .auth import auth_bp
 from .booking import booking_bp
 from .survey import survey_bp
+from .medicines import medicines_bp
+from .metrics import metrics_bp
+from .analytics import analytics_bp
+from .pharmacies import pharmacies_bp
+from .pharmacist import pharmacist_bp
 
 def register_routes(app):
     app.register_blueprint(auth_bp)
     app.register_blueprint(booking_bp)
-    app.register_blueprint(survey_bp)
\ No newline at end of file
+    app.register_blueprint(survey_bp)
+    app.register_blueprint(medicines_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(pharmacies_bp)
+    app.register_blueprint(pharmacist_bp)
\ No newline at end of file
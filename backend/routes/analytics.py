@@ -0,0 +1,58 @@
+from flask import Blueprint, request, jsonify
+from utils.security import token_required
+from utils.analytics import DIMENSIONS, NUM_BUCKETS, watermark_id
+from db.models import db, Account, AnalyticsConditionCount, AnalyticsScoreBucket
+from db.routing import read_replica
+
+
+analytics_bp = Blueprint("analytics", __name__, url_prefix="/analytics")
+
+ANALYTICS_ROLES = ("약사", "관리자")
+
+
+def forbidden(current_user):
+    account = db.session.get(Account, int(current_user["user_id"]))
+    return not account or account.role not in ANALYTICS_ROLES
+
+
+@analytics_bp.route("/conditions", methods=['GET'])
+@token_required
+@read_replica
+def conditions(current_user):
+    if forbidden(current_user):
+        return jsonify({"message": "Pharmacists only"}), 403
+
+    # 사용자별 최신 설문 기준 항목/단계별 인원
+    result = {}
+    for row in db.session.query(AnalyticsConditionCount).filter(AnalyticsConditionCount.users > 0).all():
+        result.setdefault(row.metric, {})[row.level] = row.users
+    return jsonify({"conditions": result, "as_of_survey_id": watermark_id()})
+
+
+@analytics_bp.route("/scores", methods=['GET'])
+@token_required
+@read_replica
+def scores(current_user):
+    if forbidden(current_user):
+        return jsonify({"message": "Pharmacists only"}), 403
+
+    dimension = request.args.get("by", "all")
+    if dimension not in DIMENSIONS:
+        return jsonify({"message": f"by must be one of {', '.join(DIMENSIONS)}"}), 400
+
+    groups = {}
+    for row in db.session.query(AnalyticsScoreBucket).filter(AnalyticsScoreBucket.dimension == dimension).all():
+        group = groups.setdefault(row.value, {"users": 0, "score_sum": 0.0, "histogram": [0] * NUM_BUCKETS})
+        group["users"] += row.users
+        group["score_sum"] += row.score_sum
+        group["histogram"][row.bucket] += row.users
+
+    result = {
+        value: {
+            "users": g["users"],
+            "mean_score": round(g["score_sum"] / g["users"], 2) if g["users"] else None,
+            "histogram": g["histogram"],
+        }
+        for value, g in groups.items() if g["users"]
+    }
+    return jsonify({"by": dimension, "bucket_size": 100 // NUM_BUCKETS, "groups": result, "as_of_survey_id": watermark_id()})
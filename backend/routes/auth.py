@@ -1,13 +1,20 @@
-from flask import Blueprint, request, jsonify, make_response
+import os
+import shutil
+import tempfile
+from flask import Blueprint, request, jsonify, make_response, current_app
 from utils.security import generate_jwt, token_required
 from sqlalchemy import select
 from db.models import db, Account, User
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.hashing import hash_pool, HashPoolBusy
+from utils.bulk_import import import_file, detect_format
+from utils.jobs import job_store, JobQueueFull
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
+ADMIN_ROLE = "관리자"
+
 
 @auth_bp.route("/signup", methods=["POST"])
 def signup():
@@ -24,7 +31,7 @@ def signup():
         return jsonify({"message": "User already exists"}), 409
     
     try:
-        hashed_password = generate_password_hash(password)
+        hashed_password = hash_pool.hash(password)
         
         new_account = Account(
             email = email,
@@ -46,6 +53,9 @@ def signup():
         db.session.commit()
     
         return jsonify({"message": "Signup successful"}), 201
+    except HashPoolBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "Signup failed", "error": str(e)}), 500
@@ -61,12 +71,77 @@ def login():
     
     try:
         account = db.session.query(Account).filter_by(email=email).first()
-        if account and check_password_hash(account.password_hash, password):
+        if account and hash_pool.verify(account.password_hash, password):
+            # 해시 설정이 바뀌었으면 로그인 성공 시 새 설정으로 다시 저장
+            if hash_pool.needs_rehash(account.password_hash):
+                try:
+                    account.password_hash = hash_pool.hash(password)
+                    db.session.commit()
+                except HashPoolBusy:
+                    # 재해시는 최적화일 뿐이라 풀이 바쁘면 다음 로그인으로 미룸
+                    pass
+
             token = generate_jwt({"email": email, "user_id": account.id})
             res = make_response(jsonify({"message": "Login successful", "accessToken": token}))
             #res.set_cookie("jwt", token, httponly=True, samesite="Lax", secure=False)
             return res
         else:
             return jsonify({"message": "Invalid credentials"}), 401
+    except HashPoolBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
-        return jsonify({"message": "DB request failed", "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"message": "DB request failed", "error": str(e)}), 500
+
+
+def busy_response():
+    res = make_response(jsonify({"message": "Server busy, try again later"}), 503)
+    res.headers["Retry-After"] = "1"
+    return res
+
+
+@auth_bp.route("/admin/import", methods=["POST"])
+@token_required
+def bulk_import(current_user):
+    account = db.session.get(Account, int(current_user["user_id"]))
+    if not account or account.role != ADMIN_ROLE:
+        return jsonify({"message": "Admin only"}), 403
+
+    # multipart 파일(file) 또는 본문 그대로 (CSV / JSONL)
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get("format") or detect_format(
+        upload.filename if upload else None, request.content_type
+    )
+    chunk_size = request.args.get("chunk_size", 1000, type=int)
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"message": "Import failed", "error": f"Unsupported format: {fmt}"}), 400
+
+    # 행마다 비밀번호 해시가 필요해서 큰 파일은 gunicorn timeout 을 넘김:
+    # 업로드는 임시 파일로만 받고, 가져오기는 job 으로 돌림 (결과는 GET /auth/admin/import/<job_id>)
+    with tempfile.NamedTemporaryFile(prefix="import-", suffix="." + fmt, delete=False) as f:
+        shutil.copyfileobj(stream, f)
+        path = f.name
+
+    try:
+        job_id = job_store.submit(current_app._get_current_object(), account.id, import_file, path, fmt, chunk_size)
+    except JobQueueFull:
+        os.remove(path)
+        return jsonify({"message": "Import queue is full, try again later"}), 503
+
+    return jsonify({"message": "Import started", "job_id": job_id, "status": "pending"}), 202
+
+
+@auth_bp.route("/admin/import/<job_id>", methods=["GET"])
+@token_required
+def bulk_import_status(current_user, job_id):
+    job = job_store.get(job_id)
+    if not job or job["owner"] != int(current_user["user_id"]):
+        return jsonify({"message": "Job not found"}), 404
+
+    body = {"job_id": job_id, "status": job["status"]}
+    if job["status"] == "done":
+        body["report"] = job["result"]
+    elif job["status"] == "failed":
+        body["error"] = job["error"]
+    return jsonify(body)
@@ -1,47 +1,76 @@
 from flask import Blueprint, request, jsonify, make_response
 from utils.security import generate_jwt, token_required
-from sqlalchemy import select
+from utils.idempotency import idempotent
+from sqlalchemy import select, insert as sa_insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from db.models import db, Booking
+from db.routing import read_replica
+from utils.slots import slot_cache, free_slots, slot_index
 from datetime import datetime, timedelta
 
 
 booking_bp = Blueprint("booking", __name__, url_prefix="/booking")
 
+MAX_RANGE_DAYS = 31
+MAX_PHARMACIES = 50
+ALTERNATIVE_SLOTS = 5
+
 
 @booking_bp.route("/available", methods=['GET'])
+@read_replica
 def available_slots():
-    date_str = request.args.get("date", datetime.now().strftime("%Y-%m-%d"))
-    pharmacy_id = int(request.args.get("pharmacy_id"))
-    
-    start_time = datetime.strptime(f"{date_str} 09:00", "%Y-%m-%d %H:%M")
-    end_time = datetime.strptime(f"{date_str} 17:00", "%Y-%m-%d %H:%M")
-    
-    all_slots = []
-    current_time = start_time
-    while current_time < end_time:
-        all_slots.append(current_time)
-        current_time += timedelta(minutes=30)
-
-    booked_slots = (
-        db.session.query(Booking.booked_time)
-        .filter(
-            Booking.pharmacy_id == pharmacy_id,
-            Booking.booked_time >= start_time,
-            Booking.booked_time < end_time
-        )
-        .all()
-    )
-    booked_times = {time for (time,) in booked_slots}
-    
-    available = [slot.strftime("%H:%M") for slot in all_slots if slot not in booked_times]
-    
-    return jsonify({"date": date_str, "available_slots": available})
+    # date=YYYY-MM-DD 또는 start_date~end_date, pharmacy_id 또는 pharmacy_ids=1,2,3
+    today = datetime.now().strftime("%Y-%m-%d")
+    date_str = request.args.get("date")
+    start_str = request.args.get("start_date", date_str or today)
+    end_str = request.args.get("end_date", start_str)
+    pharmacy_ids_str = request.args.get("pharmacy_ids") or request.args.get("pharmacy_id")
+
+    if not pharmacy_ids_str:
+        return jsonify({"message": "Missing required field (pharmacy_id or pharmacy_ids)."}), 400
+
+    try:
+        pharmacy_ids = list(dict.fromkeys(int(p) for p in pharmacy_ids_str.split(",") if p.strip()))
+        start_date = datetime.strptime(start_str, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end_str, "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"message": "Invalid pharmacy id or date"}), 400
+
+    num_days = (end_date - start_date).days + 1
+    if not pharmacy_ids or num_days < 1:
+        return jsonify({"message": "Invalid pharmacy id or date range"}), 400
+    if num_days > MAX_RANGE_DAYS or len(pharmacy_ids) > MAX_PHARMACIES:
+        return jsonify({"message": f"At most {MAX_RANGE_DAYS} days and {MAX_PHARMACIES} pharmacies per request"}), 400
+
+    days = [start_date + timedelta(days=i) for i in range(num_days)]
+    bitmaps = slot_cache.get_many(pharmacy_ids, days)
+
+    # 기존 형식: 약국 1곳, 하루
+    if len(pharmacy_ids) == 1 and num_days == 1 and "pharmacy_ids" not in request.args:
+        available = [slot.strftime("%H:%M") for slot in free_slots(start_date, bitmaps[(pharmacy_ids[0], start_date)])]
+        return jsonify({"date": start_str, "available_slots": available})
+
+    return jsonify({
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "pharmacies": {
+            str(pharmacy_id): {
+                day.strftime("%Y-%m-%d"): [slot.strftime("%H:%M") for slot in free_slots(day, bitmaps[(pharmacy_id, day)])]
+                for day in days
+            }
+            for pharmacy_id in pharmacy_ids
+        }
+    })
 
 
 @booking_bp.route("/create", methods=['POST'])
 @token_required
-def create_booking(current_user, user_id):
+@idempotent
+def create_booking(current_user):
     try:
+        user_id = int(current_user["user_id"])
         pharmacy_id = request.json.get("pharmacy_id")
         date_str = request.json.get("date", datetime.now().strftime("%Y-%m-%d"))
         booked_time_str = request.json.get("time")
@@ -56,20 +85,37 @@ def create_booking(current_user, user_id):
             return jsonify({"message": "Invalid pharmacy_id"}), 400
 
         # Convert date + time to datetime
-        booked_time = datetime.strptime(f"{date_str} {booked_time_str}", "%Y-%m-%d %H:%M")
+        try:
+            booked_time = datetime.strptime(f"{date_str} {booked_time_str}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            return jsonify({"message": "Invalid date or time"}), 400
+
+        # 30분 단위 상담 시간표에 있는 시간만 (10:15, 20:00 등은 슬롯이 겹칠 수 있어 거부)
+        if slot_index(booked_time) is None:
+            return jsonify({"message": "Time is not a bookable slot",
+                            "alternatives": alternative_slots(pharmacy_id, booked_time)}), 400
 
-        new_booking = Booking(
+        booking_id = insert_booking(
             user_id=user_id,
             pharmacy_id=pharmacy_id,
             booked_time=booked_time,
             comment=comment
         )
-        db.session.add(new_booking)
         db.session.commit()
+        slot_cache.mark_booked(pharmacy_id, booked_time)
+
+        if booking_id is None:
+            return jsonify({
+                "message": "Slot already booked",
+                "pharmacy_id": pharmacy_id,
+                "date": date_str,
+                "time": booked_time_str,
+                "alternatives": alternative_slots(pharmacy_id, booked_time)
+            }), 409
 
         return jsonify({
             "message": "Booking successful",
-            "booking_id": new_booking.id,
+            "booking_id": booking_id,
             "pharmacy_id": pharmacy_id,
             "date": date_str,
             "time": booked_time_str
@@ -77,4 +123,32 @@ def create_booking(current_user, user_id):
 
     except Exception as e:
         db.session.rollback()
-        return jsonify({"message": "Booking failed", "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"message": "Booking failed", "error": str(e)}), 500
+
+
+def insert_booking(**values):
+    # INSERT ... ON CONFLICT DO NOTHING: 이미 예약된 시간이면 None
+    dialect = db.engine.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = (
+            insert(Booking)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["pharmacy_id", "booked_time"])
+            .returning(Booking.id)
+        )
+        return db.session.execute(stmt).scalar()
+
+    try:
+        with db.session.begin_nested():
+            return db.session.execute(sa_insert(Booking).values(**values).returning(Booking.id)).scalar()
+    except IntegrityError:
+        return None
+
+
+def alternative_slots(pharmacy_id, booked_time, limit=ALTERNATIVE_SLOTS):
+    # 같은 날 빈 시간 중 요청 시간과 가까운 순
+    day = booked_time.date()
+    bitmap = slot_cache.get_many([pharmacy_id], [day])[(pharmacy_id, day)]
+    slots = sorted(free_slots(day, bitmap), key=lambda slot: abs((slot - booked_time).total_seconds()))
+    return [{"date": slot.strftime("%Y-%m-%d"), "time": slot.strftime("%H:%M")} for slot in slots[:limit]]
@@ -0,0 +1,35 @@
+from flask import Blueprint, request, jsonify
+from utils.search import medicine_search
+from db.routing import read_replica
+
+
+medicines_bp = Blueprint("medicines", __name__, url_prefix="/medicines")
+
+MAX_PER_PAGE = 100
+
+
+@medicines_bp.route("/search", methods=['GET'])
+@read_replica
+def search():
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"message": "Missing search query (q)"}), 400
+
+    try:
+        page = max(int(request.args.get("page", 1)), 1)
+        per_page = min(max(int(request.args.get("per_page", 20)), 1), MAX_PER_PAGE)
+    except ValueError:
+        return jsonify({"message": "Invalid page or per_page"}), 400
+
+    try:
+        total, results = medicine_search.search(q, page=page, per_page=per_page)
+    except Exception as e:
+        return jsonify({"message": "Search failed", "error": str(e)}), 500
+
+    return jsonify({
+        "query": q,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "results": results
+    })
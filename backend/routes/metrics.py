@@ -0,0 +1,36 @@
+import os
+import hmac
+from flask import Blueprint, jsonify, request
+from utils.metrics import metrics
+from utils.security import token_required
+from db.models import db, Account
+
+
+metrics_bp = Blueprint("metrics", __name__)
+
+METRICS_ROLES = ("관리자",)
+# 수집기(Prometheus 등)용 고정 토큰: Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def scrape_token_ok():
+    if not METRICS_TOKEN:
+        return False
+    header = request.headers.get("Authorization", "")
+    token = header.split(" ", 1)[1] if header.startswith("Bearer ") else header
+    return hmac.compare_digest(token.encode(), METRICS_TOKEN.encode())
+
+
+@metrics_bp.route("/metrics", methods=['GET'])
+def get_metrics():
+    if scrape_token_ok():
+        return jsonify(metrics.snapshot())
+    return admin_metrics()
+
+
+@token_required
+def admin_metrics(current_user):
+    account = db.session.get(Account, int(current_user["user_id"]))
+    if not account or account.role not in METRICS_ROLES:
+        return jsonify({"message": "Admin only"}), 403
+    return jsonify(metrics.snapshot())
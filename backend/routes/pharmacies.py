@@ -0,0 +1,71 @@
+from flask import Blueprint, request, jsonify
+from utils.geo import pharmacy_index
+from utils.slots import slot_cache, free_slots
+from db.routing import read_replica
+from datetime import datetime, timedelta
+
+
+pharmacies_bp = Blueprint("pharmacies", __name__, url_prefix="/pharmacies")
+
+DEFAULT_RADIUS_KM = 3
+MAX_RADIUS_KM = 50
+DEFAULT_K = 10
+MAX_K = 50
+SLOT_LOOKAHEAD_DAYS = 7
+
+
+@pharmacies_bp.route("/nearby", methods=['GET'])
+@read_replica
+def nearby():
+    # lat, lng 필수 / radius_km, k 선택 / with_slots=1 이면 가장 빠른 빈 시간 포함
+    try:
+        lat = float(request.args["lat"])
+        lng = float(request.args["lng"])
+        radius_km = float(request.args.get("radius_km", DEFAULT_RADIUS_KM))
+        k = int(request.args.get("k", DEFAULT_K))
+    except KeyError:
+        return jsonify({"message": "Missing required field (lat, lng)."}), 400
+    except ValueError:
+        return jsonify({"message": "Invalid lat, lng, radius_km or k"}), 400
+
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or not (0 < radius_km <= MAX_RADIUS_KM) or not (0 < k <= MAX_K):
+        return jsonify({"message": f"radius_km must be in (0, {MAX_RADIUS_KM}] and k in [1, {MAX_K}]"}), 400
+
+    pharmacy_index.ensure_fresh()
+    found = pharmacy_index.nearby(lat, lng, radius_km, k)
+
+    results = [
+        {
+            "pharmacy_id": pharmacy_id,
+            "name": name,
+            "address": address,
+            "latitude": p_lat,
+            "longitude": p_lng,
+            "distance_km": round(distance, 3),
+        }
+        for distance, (pharmacy_id, name, address, p_lat, p_lng) in found
+    ]
+
+    if request.args.get("with_slots") in ("1", "true") and results:
+        next_slots = next_free_slots([r["pharmacy_id"] for r in results])
+        for r in results:
+            slot = next_slots.get(r["pharmacy_id"])
+            r["next_free_slot"] = slot.strftime("%Y-%m-%d %H:%M") if slot else None
+
+    return jsonify({"count": len(results), "pharmacies": results})
+
+
+def next_free_slots(pharmacy_ids):
+    # 오늘부터 SLOT_LOOKAHEAD_DAYS 일치 예약을 한 번에 읽어 약국별 첫 빈 슬롯
+    now = datetime.now()
+    days = [now.date() + timedelta(days=i) for i in range(SLOT_LOOKAHEAD_DAYS)]
+    bitmaps = slot_cache.get_many(pharmacy_ids, days)
+
+    result = {}
+    for pharmacy_id in pharmacy_ids:
+        for day in days:
+            slot = next((t for t in free_slots(day, bitmaps[(pharmacy_id, day)]) if t > now), None)
+            if slot:
+                result[pharmacy_id] = slot
+                break
+    return result
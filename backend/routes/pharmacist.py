@@ -0,0 +1,110 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload, raiseload
+from utils.security import token_required
+from db.models import db, Pharmacist, Pharmacy, Booking, SurveyResponse
+from db.routing import read_replica
+from datetime import datetime, timedelta
+
+
+pharmacist_bp = Blueprint("pharmacist", __name__, url_prefix="/pharmacist")
+
+SCHEDULE_DEFAULT_DAYS = 7
+SCHEDULE_MAX_DAYS = 31
+
+
+@pharmacist_bp.route("/schedule", methods=['GET'])
+@token_required
+@read_replica
+def schedule(current_user):
+    # 약사의 모든 약국 예약 + 환자 정보 + 환자별 최신 설문 (예약 수와 관계없이 쿼리 3번)
+    try:
+        start_date = datetime.strptime(request.args.get("start_date", datetime.now().strftime("%Y-%m-%d")), "%Y-%m-%d")
+        end_str = request.args.get("end_date")
+        end_date = datetime.strptime(end_str, "%Y-%m-%d") if end_str else start_date + timedelta(days=SCHEDULE_DEFAULT_DAYS - 1)
+    except ValueError:
+        return jsonify({"message": "Invalid date"}), 400
+
+    num_days = (end_date - start_date).days + 1
+    if not (1 <= num_days <= SCHEDULE_MAX_DAYS):
+        return jsonify({"message": f"Date range must be 1-{SCHEDULE_MAX_DAYS} days"}), 400
+
+    # 1) 약사 + 약국 (joined)
+    pharmacist = db.session.execute(
+        select(Pharmacist)
+        .where(Pharmacist.account_id == int(current_user["user_id"]))
+        .options(joinedload(Pharmacist.pharmacies), raiseload("*"))
+    ).unique().scalars().first()
+    if pharmacist is None:
+        return jsonify({"message": "Pharmacists only"}), 403
+
+    pharmacies = sorted(pharmacist.pharmacies, key=lambda p: p.id)
+    if not pharmacies:
+        return jsonify({"start_date": start_date.strftime("%Y-%m-%d"), "end_date": end_date.strftime("%Y-%m-%d"), "pharmacies": []})
+
+    # 2) 기간 내 예약 + 환자 (joined), 그 외 관계는 실수로 lazy load 되지 않게 막음
+    bookings = db.session.execute(
+        select(Booking)
+        .where(
+            Booking.pharmacy_id.in_([p.id for p in pharmacies]),
+            Booking.booked_time >= start_date,
+            Booking.booked_time < end_date + timedelta(days=1)
+        )
+        .options(joinedload(Booking.user).raiseload("*"), raiseload("*"))
+        .order_by(Booking.booked_time, Booking.id)
+    ).scalars().all()
+
+    # 3) 환자별 최신 설문
+    latest = latest_surveys({b.user_id for b in bookings})
+
+    by_pharmacy = {p.id: [] for p in pharmacies}
+    for booking in bookings:
+        user = booking.user
+        by_pharmacy[booking.pharmacy_id].append({
+            "booking_id": booking.id,
+            "time": booking.booked_time.strftime("%Y-%m-%d %H:%M"),
+            "comment": booking.comment,
+            "patient": {
+                "user_id": user.id,
+                "name": user.name,
+                "gender": user.gender,
+                "dob": user.dob.strftime("%Y-%m-%d") if user.dob else None,
+            },
+            "latest_survey": latest.get(booking.user_id),
+        })
+
+    return jsonify({
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "pharmacies": [
+            {"pharmacy_id": p.id, "name": p.name, "address": p.address, "bookings": by_pharmacy[p.id]}
+            for p in pharmacies
+        ]
+    })
+
+
+def latest_surveys(user_ids):
+    if not user_ids:
+        return {}
+
+    ranked = (
+        select(
+            SurveyResponse.id, SurveyResponse.user_id, SurveyResponse.created_at, SurveyResponse.objective_responses,
+            func.row_number().over(
+                partition_by=SurveyResponse.user_id,
+                order_by=(SurveyResponse.created_at.desc(), SurveyResponse.id.desc())
+            ).label("rank")
+        )
+        .where(SurveyResponse.user_id.in_(user_ids))
+        .subquery()
+    )
+    rows = db.session.execute(select(ranked).where(ranked.c.rank == 1)).all()
+    return {
+        row.user_id: {
+            "survey_id": row.id,
+            "created_at": row.created_at.strftime("%Y-%m-%d %H:%M") if row.created_at else None,
+            "score": (row.objective_responses or {}).get("score"),
+            "conditions": (row.objective_responses or {}).get("conditions"),
+        }
+        for row in rows
+    }
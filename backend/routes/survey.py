@@ -1,273 +1,565 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, request, jsonify, make_response, current_app, Response, stream_with_context
 from utils.security import generate_jwt, token_required
-from sqlalchemy import func, or_
-from db.models import MedicineIngredient, db, SurveyResponse, User, Medicine, Ingredient
+from utils.idempotency import idempotent, idempotency_store
+from utils.llm import get_llm_client, llm_guard, LLMUnavailable, SUPPLEMENT_INGREDIENTS
+from utils.fallback import rule_based_ingredients
+from utils.jobs import job_store, JobQueueFull
+from utils.cache import make_cache
+from utils.metrics import metrics
+from utils.tracing import phase
+from utils.analytics import schedule_refresh
+from utils.catalog_index import catalog_index
+from utils.search import medicine_search
+from utils.scoring import score_record, score_batch, VITAL_COLUMNS, LIST_COLUMNS
+from utils.trends import compute_trends, to_float
+from sqlalchemy import func, or_, tuple_
+from db.models import MedicineIngredient, db, SurveyResponse, SurveyVitals, User, Medicine, Ingredient
+from db.routing import read_replica, replica_reads
 from datetime import datetime, timedelta
-from openai import OpenAI
-import os, random
-from dotenv import load_dotenv
+import os, random, json, hashlib, csv, io, base64, time
 import re
 
 survey_bp = Blueprint("survey", __name__, url_prefix="/survey")
 
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+LLM_MODEL = "gpt-4o-mini"
+
+# sync: 추천까지 기다렸다가 응답 / job: 점수와 job_id만 먼저 응답
+SURVEY_RESULT_MODE = os.getenv("SURVEY_RESULT_MODE", "sync")
+
+# 같은 프로필이면 같은 추천 성분 (RECOMMENDATION_CACHE_PATH 로 워커 간 공유)
+recommendation_cache = make_cache("RECOMMENDATION", maxsize=4096, ttl=24 * 3600)
+metrics.register_gauge("recommendation_cache", recommendation_cache.stats)
+metrics.register_gauge("llm_breaker", llm_guard.breaker.stats)
+metrics.register_gauge("idempotency", idempotency_store.stats)
+AGE_BUCKET_YEARS = 5
+
+SCORE_BATCH_MAX = int(os.getenv("SCORE_BATCH_MAX", 50000))
+
+TRENDS_MAX_POINTS = 1000
+
+HISTORY_MAX_LIMIT = 100
+HISTORY_EXPORT_BATCH = 500
+HISTORY_COLUMNS = {
+    "objective_responses": SurveyResponse.objective_responses,
+    "subjective_responses": SurveyResponse.subjective_responses,
+}
 
 
 @survey_bp.route("/result", methods=['POST'])
 @token_required
+@idempotent
 def result(current_user):
     try:
         user_id = int(current_user["user_id"])  # user_id를 int로 꺼내기
         data = request.json  # 설문 응답 및 수치 데이터
         
-        # 주관적 설문
-        overall_health_aware = data.get("overall_health_aware")
-        daily_function = data.get("daily_function")
-        life_pattern = data.get("life_pattern")
-        mental = data.get("mental")
-        inconvenience_concern = data.get("inconvenience_concern")
-        
-        subjective_score = data.get("subjective_score")
-        
-        # 주관적 점수
-        subjective_result = {
-            "주관적 점수": subjective_score,
-            "전반적 건강 인식": overall_health_aware,
-            "일상기능&체력": daily_function,
-            "생활습관(운동,수면,식사)": life_pattern,
-            "정신/감정 상태": mental,
-            "질병 관련 불편함 및 불안": inconvenience_concern
-        }
-        # 객관적 설문
-        # 건강검진결과 업로드 했을 경우
-        if data.get("upload"):
-            objective_result = calculate_objective_score_with_upload(data)
-        else:
-            objective_result = calculate_objective_score_without_upload(data)
-        
-        survey_response = SurveyResponse(
-            user_id=user_id,
-            subjective_responses=subjective_result,
-            objective_responses=objective_result,
-        )
+        with phase("score"):
+            subjective_result, objective_result = build_survey_results(data)
+
+        survey_response = new_survey_response(user_id, data, subjective_result, objective_result)
         db.session.add(survey_response)
-        db.session.commit()
-        
-        
-        user = User.query.get(user_id)
-
-        # GPT 프롬프트
-        prompt = f"""
-        성별: {user.gender}, 나이: {user.dob.year if user.dob else '미상'}, 직업군: {user.occupation}, 근무형태: {user.work_style}
-        복용중인 약물: {objective_result['medications']}
-        복용중인 영양제: {objective_result['supplements']}
-        건강검진 주요 상태: {objective_result['conditions']}
-
-        이 정보를 바탕으로 현재 건강상태를 보완할 수 있는 주요 영양제 성분 2가지 추천해줘
-        다른말은 하지 말고 이름만 적어줘
-        아래 리스트 중에서만 추천해줘 
-        DHA/EPA 제품, 밀크씨슬, 프로바이오틱스, 은행잎 추출물, 홍삼, 비타민 C, 코엔자임 Q10, 멀티비타민, 포스파티딜세린, L-테아닌, 알로에, 홍경천, 녹차추출물, 칼슘 + 비타민D, 글루코사민, 뮤코다당단백, 콘드로이친, 프락토 올리고당, 쏘팔메토 열매추출물, 비타민A, 루테인, 아스타잔틴, 바나바잎
-        """
-        
-        gpt_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 영양제 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300
-        )
-        recommendations = gpt_response.choices[0].message.content.strip()
-        print("GPT 응답:", recommendations)
+        with phase("commit"):
+            db.session.commit()
+        schedule_refresh(current_app._get_current_object())
 
-        # 쉼표, 줄바꿈 모두 기준으로 나눔
-        gpt_ingredients = [item.strip() for item in re.split(r'[,\n]', recommendations) if item.strip()]
-        print("추천 성분 리스트:", gpt_ingredients)
+        if request.args.get("mode", SURVEY_RESULT_MODE) == "job":
+            body, status = queue_recommendation(current_app._get_current_object(), user_id, objective_result)
+            return jsonify(body), status
 
-        # 디버깅용 검색 개수
-        for ing in gpt_ingredients:
-            count = db.session.query(Medicine).filter(Medicine.efficacy.ilike(f"%{ing}%")).count()
-            print(f"검색 테스트: {ing} -> {count}개")
+        return jsonify(recommend_for_user(user_id, objective_result))
 
-        supplement_list = get_random_supplements(gpt_ingredients, count=3)
+    except Exception as e:
+        return jsonify({"message": "Error calculating score", "error": str(e)}), 500
 
 
-        return jsonify({
+@survey_bp.route("/result/stream", methods=['POST'])
+@token_required
+def result_stream(current_user):
+    # text/event-stream: scores -> token... -> recommendations -> supplements -> done
+    try:
+        user_id = int(current_user["user_id"])
+        data = request.json
+
+        with phase("score"):
+            subjective_result, objective_result = build_survey_results(data)
+
+        survey_response = new_survey_response(user_id, data, subjective_result, objective_result)
+        db.session.add(survey_response)
+        with phase("commit"):
+            db.session.commit()
+        schedule_refresh(current_app._get_current_object())
+        user = db.session.get(User, user_id)
+    except Exception as e:
+        return jsonify({"message": "Error calculating score", "error": str(e)}), 500
+
+    def generate():
+        yield sse("scores", {
+            "message": "Survey saved successfully",
+            "survey_id": survey_response.id,
             "username": user.name,
             "dob": user.dob,
-            "message": "Survey saved successfully",
             "total_score": objective_result,
-            "gpt_recommendations": gpt_ingredients,
-            "supplement_list": supplement_list  # DB에서 랜덤 추천된 제품 3개
+            "subjective": subjective_result,
         })
+        try:
+            source = "llm"
+            cache_key = recommendation_cache_key(user, objective_result)
+            gpt_ingredients = recommendation_cache.get(cache_key)
+            if gpt_ingredients is None:
+                try:
+                    text = ""
+                    with phase("llm"):
+                        for delta in stream_recommendations(build_prompt(user, objective_result)):
+                            text += delta
+                            yield sse("token", {"text": delta})
+                    gpt_ingredients = ingredients_from_answer(text)
+                    recommendation_cache.set(cache_key, gpt_ingredients)
+                except LLMUnavailable as e:
+                    gpt_ingredients, source = fallback_recommendations(objective_result, e), "fallback"
+            yield sse("recommendations", {"gpt_recommendations": gpt_ingredients, "recommendation_source": source})
+
+            with phase("supplements"):
+                supplement_list = get_random_supplements(gpt_ingredients, count=3)
+            yield sse("supplements", {"supplement_list": supplement_list})
+            yield sse("done", {})
+        except Exception as e:
+            yield sse("error", {"message": "Error generating recommendations", "error": str(e)})
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # nginx 등 프록시 버퍼링 방지
+    return response
+
+
+def sse(event, payload):
+    return f"event: {event}\ndata: {current_app.json.dumps(payload)}\n\n"
+
+
+def new_survey_response(user_id, data, subjective_result, objective_result):
+    # 업로드한 검진 원본 수치는 survey_vitals 에 숫자 컬럼으로 같이 저장
+    now = datetime.utcnow()
+    survey_response = SurveyResponse(
+        user_id=user_id,
+        subjective_responses=subjective_result,
+        objective_responses=objective_result,
+        created_at=now,
+    )
+    if data.get("upload"):
+        survey_response.vitals = SurveyVitals(
+            user_id=user_id,
+            created_at=now,
+            **{column: to_float(data.get(column)) for column in VITAL_COLUMNS}
+        )
+    return survey_response
 
-    except Exception as e:
-        return jsonify({"message": "Error calculating score", "error": str(e)}), 500
+
+def build_survey_results(data):
+    # 주관적 설문
+    overall_health_aware = data.get("overall_health_aware")
+    daily_function = data.get("daily_function")
+    life_pattern = data.get("life_pattern")
+    mental = data.get("mental")
+    inconvenience_concern = data.get("inconvenience_concern")
+    
+    subjective_score = data.get("subjective_score")
     
+    # 주관적 점수
+    subjective_result = {
+        "주관적 점수": subjective_score,
+        "전반적 건강 인식": overall_health_aware,
+        "일상기능&체력": daily_function,
+        "생활습관(운동,수면,식사)": life_pattern,
+        "정신/감정 상태": mental,
+        "질병 관련 불편함 및 불안": inconvenience_concern
+    }
+    # 객관적 설문
+    # 건강검진결과 업로드 했을 경우
+    if data.get("upload"):
+        objective_result = calculate_objective_score_with_upload(data)
+    else:
+        objective_result = calculate_objective_score_without_upload(data)
 
-def get_random_supplements(ingredient_names, count=3):
-    # DB에서 GPT가 추천한 성분 중 실제 존재하는 성분만 검색
-    matched_ingredients = (
-        db.session.query(Ingredient)
-        .filter(Ingredient.name.in_(ingredient_names))
-        .all()
+    return subjective_result, objective_result
+
+
+@survey_bp.route("/result/<job_id>", methods=['GET'])
+@token_required
+def result_job(current_user, job_id):
+    user_id = int(current_user["user_id"])
+    job = job_store.get(job_id)
+    if not job or job["owner"] != user_id:
+        return jsonify({"message": "Job not found"}), 404
+
+    body = {"job_id": job_id, "status": job["status"]}
+    if job["status"] == "done":
+        body["result"] = job["result"]
+    elif job["status"] == "failed":
+        body["error"] = job["error"]
+    return jsonify(body)
+
+
+@survey_bp.route("/cache/stats", methods=['GET'])
+@token_required
+def cache_stats(current_user):
+    return jsonify(recommendation_cache.stats())
+
+
+@survey_bp.route("/score/batch", methods=['POST'])
+@token_required
+def score_batch_route(current_user):
+    try:
+        records = read_score_batch(request)
+    except ValueError as e:
+        return jsonify({"message": "Invalid batch", "error": str(e)}), 400
+
+    if len(records) > SCORE_BATCH_MAX:
+        return jsonify({"message": f"Batch too large (max {SCORE_BATCH_MAX} records)"}), 413
+
+    try:
+        results = score_batch(records)
+    except (TypeError, ValueError) as e:
+        return jsonify({"message": "Invalid batch", "error": str(e)}), 400
+
+    return jsonify({"count": len(results), "results": results})
+
+
+def read_score_batch(req):
+    # CSV: 헤더에 수치 컬럼, 목록 컬럼은 ';' 로 구분
+    upload = req.files.get("file")
+    if upload or req.mimetype == "text/csv":
+        raw = upload.read() if upload else req.get_data()
+        reader = csv.DictReader(io.StringIO(raw.decode("utf-8-sig")))
+        records = []
+        for row in reader:
+            record = {}
+            for column in VITAL_COLUMNS:
+                value = (row.get(column) or "").strip()
+                if value:
+                    record[column] = float(value)
+            for column in LIST_COLUMNS:
+                value = (row.get(column) or "").strip()
+                record[column] = [item.strip() for item in value.split(";") if item.strip()]
+            records.append(record)
+        return records
+
+    data = req.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("records")
+    if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+        raise ValueError("Expected a JSON array of records or a CSV body")
+    return data
+
+
+@survey_bp.route("/trends", methods=['GET'])
+@token_required
+@read_replica
+def trends(current_user):
+    # 검진 수치 추이: 이동 평균, 직전 대비 변화, 상태 변화 (survey_vitals 한 번 조회)
+    user_id = int(current_user["user_id"])
+    try:
+        window = int(request.args.get("window", 3))
+        limit = int(request.args.get("limit", TRENDS_MAX_POINTS))
+        since = datetime.strptime(request.args["since"], "%Y-%m-%d") if request.args.get("since") else None
+    except ValueError:
+        return jsonify({"message": "Invalid window, limit or since (YYYY-MM-DD)"}), 400
+    if not (1 <= window <= 50) or not (1 <= limit <= TRENDS_MAX_POINTS):
+        return jsonify({"message": f"window must be 1-50 and limit 1-{TRENDS_MAX_POINTS}"}), 400
+
+    query = (
+        db.session.query(SurveyVitals.survey_id, SurveyVitals.created_at,
+                         *[getattr(SurveyVitals, column) for column in VITAL_COLUMNS])
+        .filter(SurveyVitals.user_id == user_id)
     )
+    if since:
+        query = query.filter(SurveyVitals.created_at >= since)
+    # 최근 limit 개를 가져와서 오래된 순으로
+    rows = query.order_by(SurveyVitals.created_at.desc(), SurveyVitals.survey_id.desc()).limit(limit).all()
+    return jsonify(compute_trends(rows[::-1], window))
 
-    # 성분 ID 리스트
-    ingredient_ids = [ing.id for ing in matched_ingredients]
 
-    if not ingredient_ids:
-        return {
-            "recommended_ingredients": [],
-            "supplements": []
-        }
+@survey_bp.route("/history", methods=['GET'])
+@token_required
+@read_replica
+def history(current_user):
+    user_id = int(current_user["user_id"])
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), HISTORY_MAX_LIMIT)
+        cursor = decode_history_cursor(request.args.get("cursor"))
+        fields = parse_history_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"message": "Invalid history query", "error": str(e)}), 400
 
-    # 추천 성분 중 하나라도 포함된 제품 검색
+    items = fetch_history_page(user_id, fields, cursor, limit + 1)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_history_cursor(items[-1]["created_at"], items[-1]["id"])
+
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+@survey_bp.route("/history/export", methods=['GET'])
+@token_required
+def history_export(current_user):
+    user_id = int(current_user["user_id"])
+    try:
+        fields = parse_history_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"message": "Invalid history query", "error": str(e)}), 400
+
+    def generate():
+        # 페이지 단위로 읽어서 JSON 배열로 바로 흘려보냄
+        yield "["
+        cursor = None
+        first = True
+        while True:
+            items = fetch_history_page(user_id, fields, cursor, HISTORY_EXPORT_BATCH)
+            for item in items:
+                yield ("" if first else ",") + current_app.json.dumps(item)
+                first = False
+            if len(items) < HISTORY_EXPORT_BATCH:
+                break
+            cursor = (items[-1]["created_at"], items[-1]["id"])
+        yield "]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def parse_history_fields(value):
+    # fields=objective_responses.conditions,subjective_responses
+    if not value:
+        return list(HISTORY_COLUMNS)
+    fields = []
+    for field in value.split(","):
+        field = field.strip()
+        if field.split(".")[0] not in HISTORY_COLUMNS or any(not part for part in field.split(".")):
+            raise ValueError(f"Unknown field: {field}")
+        fields.append(field)
+    return fields
+
+
+def history_column(field):
+    column, *path = field.split(".")
+    expr = HISTORY_COLUMNS[column]
+    # JSON 경로 추출은 DB에서 (필요한 값만 전송)
+    return (expr[tuple(path)] if path else expr).label(field)
+
+
+def fetch_history_page(user_id, fields, cursor, limit):
     query = (
-        db.session.query(Medicine)
-        .join(MedicineIngredient, Medicine.id == MedicineIngredient.medicine_id)
-        .filter(MedicineIngredient.ingredient_id.in_(ingredient_ids))
-        .order_by(func.random())
-        .limit(count)
+        db.session.query(SurveyResponse.id, SurveyResponse.created_at, *[history_column(f) for f in fields])
+        .filter(SurveyResponse.user_id == user_id)
     )
+    if cursor:
+        query = query.filter(tuple_(SurveyResponse.created_at, SurveyResponse.id) < tuple_(*cursor))
+    rows = query.order_by(SurveyResponse.created_at.desc(), SurveyResponse.id.desc()).limit(limit).all()
+    return [dict(row._mapping) for row in rows]
 
-    supplements = [
-        {
-            "name": m.name,
-            "manufacturer": m.manufacturer,
-            "price": m.price,
-            "efficacy": m.efficacy,
-            "image_url": m.image_url
-        }
-        for m in query.all()
-    ]
 
-    return {
-        "recommended_ingredients": [ing.name for ing in matched_ingredients],
-        "supplements": supplements
+def encode_history_cursor(created_at, survey_id):
+    raw = json.dumps([created_at.isoformat(), survey_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_history_cursor(value):
+    if not value:
+        return None
+    try:
+        created_at, survey_id = json.loads(base64.urlsafe_b64decode(value.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(survey_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def recommendation_cache_key(user, objective_result):
+    age_bucket = None
+    if user.dob:
+        today = datetime.now()
+        age = today.year - user.dob.year - ((today.month, today.day) < (user.dob.month, user.dob.day))
+        age_bucket = age // AGE_BUCKET_YEARS * AGE_BUCKET_YEARS
+
+    profile = {
+        "gender": (user.gender or "").strip(),
+        "age_bucket": age_bucket,
+        "occupation": (user.occupation or "").strip(),
+        "work_style": (user.work_style or "").strip(),
+        "medications": sorted(str(m).strip() for m in objective_result.get("medications") or []),
+        "supplements": sorted(str(s).strip() for s in objective_result.get("supplements") or []),
+        "conditions": objective_result.get("conditions") or {},
     }
+    raw = json.dumps(profile, ensure_ascii=False, sort_keys=True)
+    return "rec:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def queue_recommendation(app, user_id, objective_result):
+    # ?mode=job: 추천은 job 워커에서, 응답은 (body, status)
+    try:
+        job_id = job_store.submit(app, user_id, recommend_for_user, user_id, objective_result)
+    except JobQueueFull:
+        return {"message": "Recommendation queue is full, try again later"}, 503
+    return {
+        "message": "Survey saved successfully",
+        "total_score": objective_result,
+        "job_id": job_id,
+        "status": "pending"
+    }, 202
+
+
+def recommend_for_user(user_id, objective_result):
+    user = User.query.get(user_id)
+
+    cache_key = recommendation_cache_key(user, objective_result)
+    gpt_ingredients = recommendation_cache.get(cache_key)
+    source = "llm"
+    if gpt_ingredients is None:
+        try:
+            with phase("llm"):
+                gpt_ingredients = request_recommendations(build_prompt(user, objective_result))
+            recommendation_cache.set(cache_key, gpt_ingredients)
+        except LLMUnavailable as e:
+            gpt_ingredients, source = fallback_recommendations(objective_result, e), "fallback"
+
+    return build_result(user, objective_result, gpt_ingredients, source)
+
+
+def fallback_recommendations(objective_result, error):
+    # LLM 이 느리거나 실패하면 규칙 기반 추천 (캐시에는 넣지 않음)
+    print("LLM fallback:", error)
+    metrics.incr("llm.fallback")
+    return rule_based_ingredients(objective_result)
 
+
+def build_result(user, objective_result, gpt_ingredients, source="llm"):
+    # 디버깅용 검색 개수
+    with phase("search"):
+        for ing in gpt_ingredients:
+            try:
+                count = medicine_search.count_efficacy(ing)
+            except Exception as e:
+                # 진단용 출력이라 실패해도 추천 응답은 그대로
+                db.session.rollback()
+                print(f"검색 테스트 실패: {ing} -> {e}")
+                continue
+            print(f"검색 테스트: {ing} -> {count}개")
+
+    with phase("supplements"):
+        supplement_list = get_random_supplements(gpt_ingredients, count=3)
+
+    return {
+        "username": user.name,
+        "dob": user.dob,
+        "message": "Survey saved successfully",
+        "total_score": objective_result,
+        "gpt_recommendations": gpt_ingredients,
+        "recommendation_source": source,  # llm 또는 fallback
+        "supplement_list": supplement_list  # DB에서 랜덤 추천된 제품 3개
+    }
     
-def calculate_objective_score_with_upload(data):
-    score = 100
-    medications = data.get("medications", [])
-    supplements = data.get("supplements", [])
-    past_conditions = data.get("past_conditions", [])
-    family_history = data.get("family_history", [])
 
-    score -= min(len(medications) * 4, 20)
-    score -= min(len(past_conditions) * 2, 10)
-    score -= min(len(family_history), 5)
+def build_prompt(user, objective_result):
+    # GPT 프롬프트
+    return f"""
+    성별: {user.gender}, 나이: {user.dob.year if user.dob else '미상'}, 직업군: {user.occupation}, 근무형태: {user.work_style}
+    복용중인 약물: {objective_result['medications']}
+    복용중인 영양제: {objective_result['supplements']}
+    건강검진 주요 상태: {objective_result.get('conditions')}
+
+    이 정보를 바탕으로 현재 건강상태를 보완할 수 있는 주요 영양제 성분 2가지 추천해줘
+    다른말은 하지 말고 이름만 적어줘
+    아래 리스트 중에서만 추천해줘 
+    {", ".join(SUPPLEMENT_INGREDIENTS)}
+    """
+
+
+def request_recommendations(prompt):
+    # 시간 예산/재시도/서킷 브레이커는 llm_guard, 실패하면 LLMUnavailable
+    gpt_response = llm_guard.call(get_llm_client().chat.completions.create, **llm_request(prompt))
+    return ingredients_from_answer(gpt_response.choices[0].message.content)
+
+
+def ingredients_from_answer(text):
+    recommendations = text.strip()
+    print("GPT 응답:", recommendations)
+
+    gpt_ingredients = parse_ingredients(recommendations)
+    print("추천 성분 리스트:", gpt_ingredients)
+    if not gpt_ingredients:
+        raise LLMUnavailable("empty LLM answer")
+    return gpt_ingredients
+
+
+def stream_recommendations(prompt):
+    # LLM 응답을 받는 대로 텍스트 조각 단위로 넘김 (스트림 전체도 예산 안에서)
+    started = time.perf_counter()
+    stream = llm_guard.call(
+        get_llm_client().chat.completions.create,
+        stream=True,
+        **llm_request(prompt)
+    )
+    try:
+        for chunk in stream:
+            if time.perf_counter() - started > llm_guard.budget:
+                raise LLMUnavailable("LLM stream exceeded the latency budget")
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except LLMUnavailable:
+        llm_guard.breaker.failure()
+        raise
+    except Exception as e:
+        llm_guard.breaker.failure()
+        raise LLMUnavailable(f"LLM stream failed: {e}") from e
+
+
+def llm_request(prompt):
+    # chat.completions.create 인자 (asgi.py 의 async 클라이언트도 같은 값)
+    return {"model": LLM_MODEL, "messages": llm_messages(prompt), "max_tokens": 300}
+
+
+def llm_messages(prompt):
+    return [
+        {"role": "system", "content": "당신은 영양제 전문가입니다."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def parse_ingredients(text):
+    # 쉼표, 줄바꿈 모두 기준으로 나눔
+    return [item.strip() for item in re.split(r'[,\n]', text) if item.strip()]
+
+
+def get_random_supplements(ingredient_names, count=3):
+    # 카탈로그는 사용자가 쓰는 데이터가 아니라서 항상 replica 에서 읽어도 됨
+    with replica_reads():
+        return sample_supplements(ingredient_names, count)
 
-    conditions = {}
-
-    # 5. 혈압
-    systolic = data.get("systolic", 0)
-    diastolic = data.get("diastolic", 0)
-    if systolic > 180 or diastolic > 120:
-        score -= 10
-        conditions["blood_pressure"] = "위험"
-    elif systolic >= 140 or diastolic >= 90:
-        score -= 8
-        conditions["blood_pressure"] = "위험"
-    elif systolic >= 130 or diastolic >= 80:
-        score -= 5
-        conditions["blood_pressure"] = "위험"
-    elif systolic >= 120:
-        score -= 3
-        conditions["blood_pressure"] = "주의"
-    else:
-        conditions["blood_pressure"] = "정상"
-
-    # 6. 공복혈당
-    fasting_glucose = data.get("fasting_glucose", 0)
-    if fasting_glucose >= 126:
-        score -= 10
-        conditions["fasting_glucose"] = "위험"
-    elif fasting_glucose >= 100:
-        score -= 5
-        conditions["fasting_glucose"] = "주의"
-    elif fasting_glucose < 70:
-        score -= 12
-        conditions["fasting_glucose"] = "위험"
-    else:
-        conditions["fasting_glucose"] = "정상"
-
-    # 7. BMI
-    bmi = data.get("bmi", 0)
-    if bmi < 18.5:
-        score -= 5
-        conditions["bmi"] = "위험"
-    elif bmi >= 30:
-        score -= 7
-        conditions["bmi"] = "위험"
-    elif bmi >= 25:
-        score -= 5
-        conditions["bmi"] = "위험"
-    elif bmi >= 24:
-        score -= 2
-        conditions["bmi"] = "주의"
-    else:
-        conditions["bmi"] = "정상"
-
-    # 8. AST
-    ast = data.get("ast", 0)
-    if ast > 100:
-        score -= 4
-        conditions["ast"] = "위험"
-    elif ast >= 61:
-        score -= 2
-        conditions["ast"] = "위험"
-    elif ast >= 41:
-        score -= 1
-        conditions["ast"] = "주의"
-    else:
-        conditions["ast"] = "정상"
-
-    # 9. ALT
-    alt = data.get("alt", 0)
-    if alt > 100:
-        score -= 4
-        conditions["alt"] = "위험"
-    elif alt >= 61:
-        score -= 2
-        conditions["alt"] = "위험"
-    elif alt >= 41:
-        score -= 1
-        conditions["alt"] = "주의"
-    else:
-        conditions["alt"] = "정상"
-
-    # 10. eGFR
-    egfr = data.get("egfr", 0)
-    if egfr < 15:
-        score -= 15
-        conditions["egfr"] = "위험"
-    elif egfr < 30:
-        score -= 12
-        conditions["egfr"] = "위험"
-    elif egfr < 45:
-        score -= 9
-        conditions["egfr"] = "위험"
-    elif egfr < 60:
-        score -= 6
-        conditions["egfr"] = "주의"
-    elif egfr < 90:
-        score -= 3
-        conditions["egfr"] = "주의"
-    else:
-        conditions["egfr"] = "정상"
+
+def sample_supplements(ingredient_names, count):
+    catalog_index.ensure_fresh()
+
+    # GPT가 추천한 성분 중 실제 존재하는 성분만
+    matched_names = [name for name in dict.fromkeys(ingredient_names) if name in catalog_index.ingredient_ids]
+    ingredient_ids = [catalog_index.ingredient_ids[name] for name in matched_names]
+
+    if not ingredient_ids:
+        return {
+            "recommended_ingredients": [],
+            "supplements": []
+        }
+
+    # 추천 성분 중 하나라도 포함된 제품 중 count개 추출 후 PK로 조회
+    medicine_ids = catalog_index.sample(ingredient_ids, count)
+    supplements = catalog_index.get_rows(medicine_ids)
 
     return {
-        "score": score,
-        "medications": medications,
-        "supplements": supplements,
-        "past_conditions": past_conditions,
-        "family_history": family_history,
-        "conditions": conditions
+        "recommended_ingredients": matched_names,
+        "supplements": supplements
     }
+
+    
+def calculate_objective_score_with_upload(data):
+    # 기준표는 utils/scoring.py 의 SCORING_RULES
+    return score_record(data)
             
             
 # 건강검진결과 업로드 안했을 경우
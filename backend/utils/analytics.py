@@ -0,0 +1,257 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, delete, func
+from db.models import (
+    db, SurveyResponse, User,
+    AnalyticsUserState, AnalyticsConditionCount, AnalyticsScoreBucket, AnalyticsWatermark,
+)
+
+WATERMARK = "survey_responses"
+DIMENSIONS = ["all", "occupation", "work_style"]
+NUM_BUCKETS = 10
+UNKNOWN = "미상"
+# 워터마크 아래로 다시 읽는 id 범위 (동시 쓰기에서 작은 id 가 늦게 커밋되는 경우)
+OVERLAP_IDS = int(os.getenv("ANALYTICS_OVERLAP_IDS", 1000))
+
+
+def score_bucket(score):
+    # 0~100 점을 10점 단위 구간으로 (100점은 마지막 구간)
+    return min(max(int(score // 10), 0), NUM_BUCKETS - 1)
+
+
+def make_state(user_id, survey_id, objective, occupation, work_style):
+    score = (objective or {}).get("score")
+    return {
+        "user_id": user_id,
+        "survey_id": survey_id,
+        "score": float(score) if isinstance(score, (int, float)) else None,
+        "occupation": occupation or UNKNOWN,
+        "work_style": work_style or UNKNOWN,
+        "conditions": (objective or {}).get("conditions") or {},
+    }
+
+
+def apply_state(state, sign, condition_deltas, bucket_deltas):
+    # 사용자 한 명의 최신 상태가 집계에 기여하는 만큼 더하거나(+1) 뺌(-1)
+    for metric, level in state["conditions"].items():
+        key = (metric, level)
+        condition_deltas[key] = condition_deltas.get(key, 0) + sign
+    if state["score"] is None:
+        return
+    bucket = score_bucket(state["score"])
+    for dimension in DIMENSIONS:
+        value = "all" if dimension == "all" else state[dimension]
+        users, score_sum = bucket_deltas.get((dimension, value, bucket), (0, 0.0))
+        bucket_deltas[(dimension, value, bucket)] = (users + sign, score_sum + sign * state["score"])
+
+
+def refresh(batch_size=500, max_batches=None):
+    """Fold survey_responses newer than the watermark into the rollups, one small transaction per batch.
+
+    Each run starts OVERLAP_IDS below the watermark so rows that committed late are not skipped; a row is
+    applied only if it is newer than the user's AnalyticsUserState.survey_id, so re-reading is harmless.
+    """
+    cursor = max(watermark_id() - OVERLAP_IDS, 0)
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        scanned, applied, cursor = _refresh_batch(cursor, batch_size)
+        processed += applied
+        batches += 1
+        if scanned < batch_size:
+            break
+    return processed
+
+
+def _refresh_batch(cursor, batch_size):
+    watermark = db.session.execute(
+        select(AnalyticsWatermark).where(AnalyticsWatermark.name == WATERMARK).with_for_update()
+    ).scalar_one_or_none()
+    if watermark is None:
+        watermark = AnalyticsWatermark(name=WATERMARK, last_survey_id=0)
+        db.session.add(watermark)
+
+    rows = db.session.execute(
+        select(SurveyResponse.id, SurveyResponse.user_id, SurveyResponse.objective_responses,
+               User.occupation, User.work_style)
+        .join(User, User.id == SurveyResponse.user_id)
+        .where(SurveyResponse.id > cursor)
+        .order_by(SurveyResponse.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        db.session.commit()
+        return 0, 0, cursor
+
+    user_ids = {row.user_id for row in rows}
+    states = {
+        s.user_id: s
+        for s in db.session.execute(
+            select(AnalyticsUserState).where(AnalyticsUserState.user_id.in_(user_ids))
+        ).scalars()
+    }
+
+    condition_deltas, bucket_deltas = {}, {}
+    applied = 0
+    for row in rows:
+        old = states.get(row.user_id)
+        if old is not None and old.survey_id >= row.id:
+            continue  # 이미 반영했거나 더 최신 설문이 반영됨
+        applied += 1
+        new = make_state(row.user_id, row.id, row.objective_responses, row.occupation, row.work_style)
+        if old is not None:
+            apply_state(state_dict(old), -1, condition_deltas, bucket_deltas)
+            for key in ("survey_id", "score", "occupation", "work_style", "conditions"):
+                setattr(old, key, new[key])
+        else:
+            states[row.user_id] = AnalyticsUserState(**new)
+            db.session.add(states[row.user_id])
+        apply_state(new, 1, condition_deltas, bucket_deltas)
+
+    apply_deltas(condition_deltas, bucket_deltas)
+    watermark.last_survey_id = max(watermark.last_survey_id, rows[-1].id)
+    db.session.commit()
+    return len(rows), applied, rows[-1].id
+
+
+def state_dict(state):
+    return {
+        "score": state.score,
+        "occupation": state.occupation,
+        "work_style": state.work_style,
+        "conditions": state.conditions or {},
+    }
+
+
+def apply_deltas(condition_deltas, bucket_deltas):
+    for (metric, level), delta in condition_deltas.items():
+        if not delta:
+            continue
+        row = db.session.get(AnalyticsConditionCount, (metric, level))
+        if row is None:
+            row = AnalyticsConditionCount(metric=metric, level=level, users=0)
+            db.session.add(row)
+        row.users += delta
+
+    for (dimension, value, bucket), (users, score_sum) in bucket_deltas.items():
+        if not users and not score_sum:
+            continue
+        row = db.session.get(AnalyticsScoreBucket, (dimension, value, bucket))
+        if row is None:
+            row = AnalyticsScoreBucket(dimension=dimension, value=value, bucket=bucket, users=0, score_sum=0.0)
+            db.session.add(row)
+        row.users += users
+        row.score_sum += score_sum
+
+
+def full_scan():
+    """Recompute the expected rollups from every survey row (latest survey per user wins)."""
+    latest = {}
+    rows = db.session.execute(
+        select(SurveyResponse.id, SurveyResponse.user_id, SurveyResponse.objective_responses,
+               User.occupation, User.work_style)
+        .join(User, User.id == SurveyResponse.user_id)
+        .order_by(SurveyResponse.id)
+        .execution_options(yield_per=2000)
+    )
+    max_id = 0
+    for row in rows:
+        latest[row.user_id] = make_state(row.user_id, row.id, row.objective_responses, row.occupation, row.work_style)
+        max_id = row.id
+
+    condition_deltas, bucket_deltas = {}, {}
+    for state in latest.values():
+        apply_state(state, 1, condition_deltas, bucket_deltas)
+    return latest, condition_deltas, bucket_deltas, max_id
+
+
+def current_rollups():
+    conditions = {(r.metric, r.level): r.users for r in db.session.query(AnalyticsConditionCount)}
+    buckets = {(r.dimension, r.value, r.bucket): (r.users, r.score_sum) for r in db.session.query(AnalyticsScoreBucket)}
+    return conditions, buckets
+
+
+def check():
+    """Compare the stored rollups with a full scan; returns a list of differences."""
+    refresh()
+    _, expected_conditions, expected_buckets, _ = full_scan()
+    conditions, buckets = current_rollups()
+
+    diffs = []
+    for key in set(expected_conditions) | set(conditions):
+        expected, actual = expected_conditions.get(key, 0), conditions.get(key, 0)
+        if expected != actual:
+            diffs.append({"table": "conditions", "key": list(key), "expected": expected, "actual": actual})
+    for key in set(expected_buckets) | set(buckets):
+        expected, actual = expected_buckets.get(key, (0, 0.0)), buckets.get(key, (0, 0.0))
+        if expected[0] != actual[0] or abs(expected[1] - actual[1]) > 1e-6:
+            diffs.append({"table": "scores", "key": list(key), "expected": list(expected), "actual": list(actual)})
+    return diffs
+
+
+def rebuild():
+    latest, condition_counts, bucket_counts, max_id = full_scan()
+    db.session.execute(delete(AnalyticsConditionCount))
+    db.session.execute(delete(AnalyticsScoreBucket))
+    db.session.execute(delete(AnalyticsUserState))
+    db.session.execute(delete(AnalyticsWatermark))
+    db.session.add_all(AnalyticsUserState(**state) for state in latest.values())
+    db.session.add_all(
+        AnalyticsConditionCount(metric=metric, level=level, users=users)
+        for (metric, level), users in condition_counts.items() if users
+    )
+    db.session.add_all(
+        AnalyticsScoreBucket(dimension=dimension, value=value, bucket=bucket, users=users, score_sum=score_sum)
+        for (dimension, value, bucket), (users, score_sum) in bucket_counts.items() if users
+    )
+    db.session.add(AnalyticsWatermark(name=WATERMARK, last_survey_id=max_id))
+    db.session.commit()
+    return {"users": len(latest), "last_survey_id": max_id}
+
+
+def watermark_id():
+    return db.session.execute(
+        select(func.coalesce(func.max(AnalyticsWatermark.last_survey_id), 0))
+        .where(AnalyticsWatermark.name == WATERMARK)
+    ).scalar()
+
+
+class RefreshScheduler:
+    """Runs refresh() on one background thread after survey writes; extra requests while running coalesce."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics")
+        self.lock = threading.Lock()
+        self.running = False
+        self.dirty = False
+
+    def request(self, app):
+        with self.lock:
+            self.dirty = True
+            if self.running:
+                return
+            self.running = True
+        self.executor.submit(self._run, app)
+
+    def _run(self, app):
+        while True:
+            with self.lock:
+                if not self.dirty:
+                    self.running = False
+                    return
+                self.dirty = False
+            try:
+                with app.app_context():
+                    refresh()
+            except Exception as e:
+                print("Analytics refresh failed:", e)
+
+
+refresh_scheduler = RefreshScheduler()
+ANALYTICS_AUTO_REFRESH = os.getenv("ANALYTICS_AUTO_REFRESH", "1") == "1"
+
+
+def schedule_refresh(app):
+    if ANALYTICS_AUTO_REFRESH:
+        refresh_scheduler.request(app)
@@ -0,0 +1,216 @@
+import io
+import os
+import csv
+import json
+import time
+from datetime import datetime
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from db.models import db, Account, User
+from utils.hashing import import_hash_pool
+
+USER_FIELDS = ["email", "password", "name", "dob", "gender", "occupation", "work_style", "role"]
+DEFAULT_ROLE = "환자"
+# 파일로는 관리자 계정을 만들 수 없음
+IMPORT_ROLES = {"환자", "약사"}
+MAX_REPORTED_ERRORS = 1000
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, row dict) from a binary or text CSV / JSONL stream without loading it all."""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig")
+
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_no, {"_error": f"Invalid JSON: {e}"}
+                continue
+            yield line_no, row if isinstance(row, dict) else {"_error": "Expected a JSON object"}
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def detect_format(filename=None, content_type=None, default="csv"):
+    if filename and filename.lower().endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    if content_type and ("ndjson" in content_type or "jsonl" in content_type):
+        return "jsonl"
+    return default
+
+
+class ImportReport:
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.error_count = 0
+        self.started = time.perf_counter()
+
+    def error(self, line, email, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "email": email, "error": message})
+
+    def to_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "total": self.total,
+            "created": self.created,
+            "skipped": self.skipped,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.total / elapsed, 1) if elapsed else None,
+        }
+
+
+def text_field(row, name):
+    # JSONL 은 숫자 등도 올 수 있음 -> 행 오류로 보고
+    value = row.get(name)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+
+def validate(line, row):
+    if row.get("_error"):
+        raise ValueError(row["_error"])
+    email = text_field(row, "email").strip()
+    password = text_field(row, "password")
+    if not email or "@" not in email:
+        raise ValueError("Invalid or missing email")
+    if not password:
+        raise ValueError("Missing password")
+    role = text_field(row, "role").strip() or DEFAULT_ROLE
+    if role not in IMPORT_ROLES:
+        raise ValueError(f"Role not allowed: {role}")
+    dob = text_field(row, "dob").strip()
+    return {
+        "line": line,
+        "email": email,
+        "password": password,
+        "name": text_field(row, "name") or None,
+        "dob": datetime.strptime(dob, "%Y-%m-%d") if dob else None,
+        "gender": text_field(row, "gender") or None,
+        "occupation": text_field(row, "occupation") or None,
+        "work_style": text_field(row, "work_style") or None,
+        "role": role,
+    }
+
+
+def import_file(path, fmt, chunk_size=1000):
+    # 백그라운드 job 용: 업로드를 저장한 임시 파일을 읽고 지움
+    try:
+        with open(path, "rb") as f:
+            return import_users(read_rows(f, fmt), chunk_size=chunk_size)
+    finally:
+        os.remove(path)
+
+
+def import_users(rows, chunk_size=1000, progress=None):
+    """Import (line, row) pairs in chunked transactions; bad rows are reported, not fatal."""
+    report = ImportReport()
+    seen = set()
+    chunk = []
+
+    for line, row in rows:
+        report.total += 1
+        try:
+            user = validate(line, row)
+        except ValueError as e:
+            report.error(line, row.get("email"), str(e))
+            continue
+        if user["email"] in seen:
+            report.skipped += 1
+            report.error(line, user["email"], "Duplicate email in file")
+            continue
+        seen.add(user["email"])
+        chunk.append(user)
+
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, report)
+            chunk = []
+            if progress:
+                progress(report)
+
+    if chunk:
+        _import_chunk(chunk, report)
+    if progress:
+        progress(report)
+    return report.to_dict()
+
+
+def _import_chunk(chunk, report):
+    # 이미 가입된 이메일은 한 번의 쿼리로 제외
+    emails = [user["email"] for user in chunk]
+    existing = set(db.session.execute(select(Account.email).where(Account.email.in_(emails))).scalars())
+    fresh = []
+    for user in chunk:
+        if user["email"] in existing:
+            report.skipped += 1
+            report.error(user["line"], user["email"], "User already exists")
+        else:
+            fresh.append(user)
+    if not fresh:
+        return
+
+    for user, password_hash in zip(fresh, import_hash_pool.hash_many([user["password"] for user in fresh])):
+        user["password_hash"] = password_hash
+
+    try:
+        _insert(fresh)
+        db.session.commit()
+        report.created += len(fresh)
+    except SQLAlchemyError:
+        # 다른 요청과 겹친 경우 등: 한 건씩 다시 넣어서 실패한 행만 보고
+        db.session.rollback()
+        for user in fresh:
+            try:
+                _insert([user])
+                db.session.commit()
+                report.created += 1
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                report.error(user["line"], user["email"], str(e.orig if hasattr(e, "orig") else e))
+
+
+def _insert(users):
+    created_at = datetime.utcnow()
+    account_ids = dict(
+        (email, account_id)
+        for account_id, email in db.session.execute(
+            insert(Account).returning(Account.id, Account.email),
+            [
+                {"email": u["email"], "password_hash": u["password_hash"], "role": u["role"], "created_at": created_at}
+                for u in users
+            ],
+        )
+    )
+    db.session.execute(
+        insert(User),
+        [
+            {
+                "account_id": account_ids[u["email"]],
+                "name": u["name"],
+                "gender": u["gender"],
+                "dob": u["dob"],
+                "occupation": u["occupation"],
+                "work_style": u["work_style"],
+            }
+            for u in users
+        ],
+    )
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class SqliteCacheBackend:
+    """Shared cache in a local SQLite file so every gunicorn worker on the host sees the same entries."""
+
+    def __init__(self, path, ttl, maxsize):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_used_at ON cache (used_at)")
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE cache SET used_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now + self.ttl, now),
+        )
+        # 만료된 항목 삭제 후 가장 오래 안 쓰인 항목부터 정리
+        conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and an optional shared backend behind it."""
+
+    def __init__(self, maxsize=1024, ttl=3600, backend=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at >= now:
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.data[key]
+
+        value = self.backend.get(key) if self.backend else None
+        with self.lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put(key, value, now)
+        return value
+
+    def set(self, key, value):
+        with self.lock:
+            self._put(key, value, time.time())
+        if self.backend:
+            self.backend.set(key, value)
+
+    def _put(self, key, value, now):
+        self.data[key] = (value, now + self.ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self.data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "shared": self.backend is not None,
+            }
+
+
+def make_cache(prefix, maxsize=1024, ttl=3600):
+    # <PREFIX>_CACHE_PATH 가 있으면 워커 간 공유 캐시 사용
+    maxsize = int(os.getenv(f"{prefix}_CACHE_SIZE", maxsize))
+    ttl = int(os.getenv(f"{prefix}_CACHE_TTL", ttl))
+    path = os.getenv(f"{prefix}_CACHE_PATH")
+    backend = SqliteCacheBackend(path, ttl, maxsize) if path else None
+    return TTLCache(maxsize=maxsize, ttl=ttl, backend=backend)
@@ -0,0 +1,125 @@
+import os
+import time
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from sqlalchemy import select
+from db.models import db, Medicine, Ingredient, MedicineIngredient
+from utils.versioning import track_model_version, rebuild_if_stale
+
+# bulk 작업(ORM 이벤트 없음) 후에는 bump_catalog_version() 을 직접 호출
+catalog_tracker = track_model_version("catalog", Medicine, Ingredient, MedicineIngredient)
+catalog_version = catalog_tracker.current
+bump_catalog_version = catalog_tracker.bump
+
+
+def medicine_to_dict(m):
+    return {
+        "name": m.name,
+        "manufacturer": m.manufacturer,
+        "price": m.price,
+        "efficacy": m.efficacy,
+        "image_url": m.image_url
+    }
+
+
+class CatalogIndex:
+    """ingredient id -> medicine id array, plus an LRU cache of medicine rows (rebuilt on catalog_version or ttl)."""
+
+    def __init__(self, ttl=300, row_cache_size=5000):
+        self.ttl = ttl
+        self.row_cache_size = row_cache_size
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.ingredient_ids = {}
+        self.postings = {}
+        self.rows = OrderedDict()
+
+    def build(self):
+        version = catalog_version()
+        ingredient_ids = {
+            name: ing_id
+            for ing_id, name in db.session.execute(select(Ingredient.id, Ingredient.name))
+        }
+
+        postings = {}
+        links = db.session.execute(
+            select(MedicineIngredient.ingredient_id, MedicineIngredient.medicine_id)
+            .order_by(MedicineIngredient.ingredient_id, MedicineIngredient.medicine_id)
+            .execution_options(yield_per=10000)
+        )
+        for ing_id, med_id in links:
+            ids = postings.get(ing_id)
+            if ids is None:
+                ids = postings[ing_id] = array("l")
+            if not ids or ids[-1] != med_id:
+                ids.append(med_id)
+
+        with self.lock:
+            self.ingredient_ids = ingredient_ids
+            self.postings = postings
+            self.rows = OrderedDict()
+            self.version = version
+            self.built_at = time.time()
+
+    def ensure_fresh(self):
+        rebuild_if_stale(self, catalog_version)
+
+    def sample(self, ingredient_ids, k):
+        lists = [self.postings[i] for i in ingredient_ids if len(self.postings.get(i, ()))]
+        total = sum(len(ids) for ids in lists)
+        if total == 0:
+            return []
+
+        # 후보가 적으면 전부 모아서 섞기
+        if total <= k * 4:
+            union = list(dict.fromkeys(med_id for ids in lists for med_id in ids))
+            random.shuffle(union)
+            return union[:k]
+
+        # 링크 단위로 균등 추출 (ORDER BY random() 과 같은 가중치), 중복은 다시 뽑기
+        chosen = []
+        seen = set()
+        attempts = 0
+        while len(chosen) < k and attempts < k * 20:
+            attempts += 1
+            r = random.randrange(total)
+            for ids in lists:
+                if r < len(ids):
+                    med_id = ids[r]
+                    break
+                r -= len(ids)
+            if med_id not in seen:
+                seen.add(med_id)
+                chosen.append(med_id)
+        return chosen
+
+    def get_rows(self, medicine_ids):
+        found = {}
+        with self.lock:
+            for med_id in medicine_ids:
+                row = self.rows.get(med_id)
+                if row is not None:
+                    self.rows.move_to_end(med_id)
+                    found[med_id] = row
+
+        # 캐시에 없는 제품만 PK로 조회
+        missing = [med_id for med_id in medicine_ids if med_id not in found]
+        if missing:
+            fetched = db.session.query(Medicine).filter(Medicine.id.in_(missing)).all()
+            with self.lock:
+                for m in fetched:
+                    found[m.id] = self.rows[m.id] = medicine_to_dict(m)
+                while len(self.rows) > self.row_cache_size:
+                    self.rows.popitem(last=False)
+
+        return [found[med_id] for med_id in medicine_ids if med_id in found]
+
+
+catalog_index = CatalogIndex(
+    ttl=int(os.getenv("CATALOG_INDEX_TTL", 300)),
+    row_cache_size=int(os.getenv("CATALOG_ROW_CACHE_SIZE", 5000)),
+)
@@ -0,0 +1,247 @@
+import io
+import csv
+import json
+import time
+import hashlib
+from sqlalchemy import select, insert, update, delete
+from db.models import db, Medicine, Ingredient, MedicineIngredient
+from utils.catalog_index import bump_catalog_version
+from db.migrations import medicine_name_key
+
+MEDICINE_FIELDS = ["name", "manufacturer", "price", "efficacy", "image_url"]
+
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """Yield items of a top-level JSON array one by one without reading the whole file."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    started = False
+    while True:
+        data = stream.read(chunk_size)
+        buf += data
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if not started:
+                if pos < len(buf):
+                    if buf[pos] != "[":
+                        raise ValueError("Expected a JSON array")
+                    started = True
+                    pos += 1
+                    continue
+                break
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if not data:
+                    raise
+                break
+            if end == len(buf) and data:
+                # 숫자 등이 청크 경계에서 잘렸을 수 있음
+                break
+            yield item
+            pos = end
+        buf = buf[pos:]
+        if not data:
+            if buf.strip():
+                raise ValueError("Unexpected end of JSON array")
+            return
+
+
+def read_catalog(stream, fmt):
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig")
+
+    if fmt == "csv":
+        # ingredients 컬럼은 ';' 로 구분
+        for row in csv.DictReader(stream):
+            row["ingredients"] = [i.strip() for i in (row.get("ingredients") or "").split(";") if i.strip()]
+            yield row
+    elif fmt == "jsonl":
+        # 깨진 줄은 오류 행으로 세고 계속 적재
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield {"_error": f"Invalid JSON: {e}"}
+                continue
+            yield row if isinstance(row, dict) else {"_error": "Expected a JSON object"}
+    elif fmt == "json":
+        for item in iter_json_array(stream):
+            yield item if isinstance(item, dict) else {"_error": "Expected a JSON object"}
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def detect_catalog_format(path):
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".json"):
+        return "json"
+    return "csv"
+
+
+def text_value(value, field):
+    # JSON 숫자는 문자열로 바꾸고, 객체/배열/true 등은 행 오류
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"{field} must be a string or number")
+    return str(value).strip() or None
+
+
+def normalize(row):
+    if row.get("_error"):
+        raise ValueError(row["_error"])
+    record = {field: text_value(row.get(field), field) for field in MEDICINE_FIELDS}
+    name = record["name"]
+    if not name:
+        raise ValueError("Missing name")
+    ingredients = row.get("ingredients") or []
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(";")
+    if not isinstance(ingredients, list):
+        raise ValueError("ingredients must be a list or a ';' separated string")
+    record["ingredients"] = sorted({i for i in (text_value(i, "ingredients") for i in ingredients) if i})
+
+    # 제품 코드가 없으면 이름+제조사로 키 생성 (upgrade-db 가 기존 행에 채우는 키와 같음)
+    record["name_key"] = medicine_name_key(name, record["manufacturer"])
+    record["code"] = text_value(row.get("code"), "code") or record["name_key"]
+    record["content_hash"] = hashlib.sha1(
+        json.dumps([record[f] for f in MEDICINE_FIELDS] + [record["ingredients"]], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return record
+
+
+class CatalogLoader:
+    """Streams catalog rows into medicines / ingredients / medicines_ingredients in chunked transactions."""
+
+    def __init__(self, chunk_size=2000, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.ingredient_ids = {}
+        self.stats = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "errors": 0,
+                      "new_ingredients": 0, "links": 0}
+        self.errors = []
+        self.started = None
+
+    def load(self, rows):
+        self.started = time.perf_counter()
+        self.ingredient_ids = dict(db.session.execute(select(Ingredient.name, Ingredient.id)).all())
+
+        chunk = {}
+        for row in rows:
+            self.stats["rows"] += 1
+            try:
+                record = normalize(row)
+            except (ValueError, TypeError) as e:
+                self.stats["errors"] += 1
+                if len(self.errors) < 1000:
+                    self.errors.append({"row": self.stats["rows"], "error": str(e)})
+                continue
+            chunk[record["code"]] = record
+            if len(chunk) >= self.chunk_size:
+                self._load_chunk(list(chunk.values()))
+                chunk = {}
+
+        if chunk:
+            self._load_chunk(list(chunk.values()))
+        bump_catalog_version()
+        return self.report()
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        return dict(
+            self.stats,
+            seconds=round(elapsed, 3),
+            rows_per_second=round(self.stats["rows"] / elapsed, 1) if elapsed else None,
+            error_samples=self.errors,
+        )
+
+    def _ensure_ingredients(self, records):
+        names = sorted({name for r in records for name in r["ingredients"] if name not in self.ingredient_ids})
+        if not names:
+            return
+        for ing_id, name in db.session.execute(
+            insert(Ingredient).returning(Ingredient.id, Ingredient.name), [{"name": name} for name in names]
+        ):
+            self.ingredient_ids[name] = ing_id
+        self.stats["new_ingredients"] += len(names)
+
+    def _load_chunk(self, records):
+        try:
+            self._ensure_ingredients(records)
+
+            existing = {
+                code: (med_id, content_hash)
+                for code, med_id, content_hash in db.session.execute(
+                    select(Medicine.code, Medicine.id, Medicine.content_hash)
+                    .where(Medicine.code.in_([r["code"] for r in records]))
+                )
+            }
+            self._adopt_legacy_rows(records, existing)
+            new = [r for r in records if r["code"] not in existing]
+            changed = [r for r in records if r["code"] in existing and existing[r["code"]][1] != r["content_hash"]]
+            self.stats["unchanged"] += len(records) - len(new) - len(changed)
+
+            med_ids = {}
+            if new:
+                for med_id, code in db.session.execute(
+                    insert(Medicine).returning(Medicine.id, Medicine.code),
+                    [self._medicine_values(r) for r in new],
+                ):
+                    med_ids[code] = med_id
+            if changed:
+                for r in changed:
+                    med_ids[r["code"]] = existing[r["code"]][0]
+                db.session.execute(
+                    update(Medicine),
+                    [dict(self._medicine_values(r), id=med_ids[r["code"]]) for r in changed],
+                )
+                db.session.execute(
+                    delete(MedicineIngredient).where(
+                        MedicineIngredient.medicine_id.in_([med_ids[r["code"]] for r in changed])
+                    )
+                )
+
+            links = [
+                {"medicine_id": med_ids[r["code"]], "ingredient_id": self.ingredient_ids[name]}
+                for r in new + changed
+                for name in r["ingredients"]
+            ]
+            if links:
+                db.session.execute(insert(MedicineIngredient), links)
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self.ingredient_ids = dict(db.session.execute(select(Ingredient.name, Ingredient.id)).all())
+            raise
+
+        self.stats["inserted"] += len(new)
+        self.stats["updated"] += len(changed)
+        self.stats["links"] += len(links)
+        if self.progress:
+            self.progress(self.report())
+
+    def _adopt_legacy_rows(self, records, existing):
+        # 코드 없이 적재된 기존 행(이름+제조사 키)은 새 제품 코드로 바꿔서 갱신
+        missing = {r["name_key"]: r for r in records if r["code"] not in existing and r["code"] != r["name_key"]}
+        if not missing:
+            return
+        for med_id, name_key in db.session.execute(
+            select(Medicine.id, Medicine.code).where(Medicine.code.in_(list(missing)))
+        ):
+            existing[missing[name_key]["code"]] = (med_id, None)
+
+    def _medicine_values(self, r):
+        values = {field: r[field] for field in MEDICINE_FIELDS}
+        values["code"] = r["code"]
+        values["content_hash"] = r["content_hash"]
+        return values
@@ -0,0 +1,74 @@
+from utils.llm import SUPPLEMENT_INGREDIENTS
+
+# LLM 을 못 쓸 때 쓰는 규칙 기반 추천 (같은 입력이면 항상 같은 결과)
+LEVEL_WEIGHTS = {"위험": 2, "주의": 1}
+
+CONDITION_INGREDIENTS = {
+    "blood_pressure": ["코엔자임 Q10", "DHA/EPA 제품"],
+    "fasting_glucose": ["바나바잎", "프락토 올리고당"],
+    "bmi": ["녹차추출물", "프로바이오틱스"],
+    "ast": ["밀크씨슬"],
+    "alt": ["밀크씨슬"],
+    "egfr": ["홍삼"],
+}
+
+# 약물/과거 질환/가족력 텍스트에 들어있는 키워드 -> 성분
+KEYWORD_INGREDIENTS = [
+    (("스타틴", "고지혈", "콜레스테롤"), ["코엔자임 Q10", "DHA/EPA 제품"]),
+    (("고혈압", "혈압약"), ["코엔자임 Q10"]),
+    (("당뇨", "메트포르민", "혈당"), ["바나바잎"]),
+    (("간염", "지방간", "간기능", "음주"), ["밀크씨슬"]),
+    (("관절", "골관절", "연골"), ["글루코사민", "콘드로이친"]),
+    (("골다공", "뼈"), ["칼슘 + 비타민D"]),
+    (("눈", "안구", "시력", "황반"), ["루테인", "비타민A"]),
+    (("수면", "불면", "불안"), ["L-테아닌"]),
+    (("스트레스", "피로"), ["홍경천", "홍삼"]),
+    (("기억", "치매", "인지"), ["포스파티딜세린", "은행잎 추출물"]),
+    (("전립선",), ["쏘팔메토 열매추출물"]),
+    (("장염", "대장", "변비", "과민성"), ["프로바이오틱스", "알로에"]),
+    (("위염", "위궤양", "역류"), ["뮤코다당단백"]),
+]
+
+DEFAULT_INGREDIENTS = ["멀티비타민", "비타민 C"]
+
+
+def check_fallback_tables():
+    # create_app 에서 호출: 규칙 표의 성분은 모두 LLM 후보(SUPPLEMENT_INGREDIENTS)에 있어야 함
+    unknown = sorted({
+        name
+        for names in [*CONDITION_INGREDIENTS.values(), *(names for _, names in KEYWORD_INGREDIENTS), DEFAULT_INGREDIENTS]
+        for name in names
+        if name not in SUPPLEMENT_INGREDIENTS
+    })
+    if unknown:
+        raise RuntimeError(f"Fallback ingredients missing from SUPPLEMENT_INGREDIENTS: {', '.join(unknown)}")
+
+
+def rule_based_ingredients(objective_result, k=2):
+    """Pick k ingredients from SUPPLEMENT_INGREDIENTS for the checkup conditions and history."""
+    weights = {}
+
+    def add(names, weight):
+        for name in names:
+            weights[name] = weights.get(name, 0) + weight
+
+    for metric, level in (objective_result.get("conditions") or {}).items():
+        if level in LEVEL_WEIGHTS:
+            add(CONDITION_INGREDIENTS.get(metric, []), LEVEL_WEIGHTS[level])
+
+    texts = [str(item) for column in ("medications", "past_conditions", "family_history")
+             for item in objective_result.get(column) or []]
+    for keywords, names in KEYWORD_INGREDIENTS:
+        if any(keyword in text for text in texts for keyword in keywords):
+            add(names, 1)
+
+    # 이미 먹고 있는 영양제는 제외
+    taking = " ".join(str(item) for item in objective_result.get("supplements") or [])
+    ranked = sorted(
+        (name for name in weights if name not in taking),
+        key=lambda name: (-weights[name], SUPPLEMENT_INGREDIENTS.index(name)),
+    )
+    for name in DEFAULT_INGREDIENTS:
+        if name not in ranked and name not in taking:
+            ranked.append(name)
+    return ranked[:k]
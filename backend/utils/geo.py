@@ -0,0 +1,146 @@
+import os
+import io
+import csv
+import math
+import time
+import heapq
+import threading
+from sqlalchemy import select, update
+from db.models import db, Pharmacy
+from utils.versioning import track_model_version, rebuild_if_stale
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+pharmacy_tracker = track_model_version("pharmacies", Pharmacy)
+pharmacy_version = pharmacy_tracker.current
+bump_pharmacy_version = pharmacy_tracker.bump
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def normalize_address(address):
+    return " ".join((address or "").replace(",", " ").split())
+
+
+def read_geocode_table(stream):
+    """Local lookup CSV (address, latitude, longitude) -> {normalized address: (lat, lng)}."""
+    table = {}
+    for row in csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig")):
+        try:
+            table[normalize_address(row["address"])] = (float(row["latitude"]), float(row["longitude"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return table
+
+
+def lookup(table, address):
+    # 정확히 없으면 뒤쪽 토큰(층, 호수 등)을 떼어가며 가장 긴 앞부분으로 찾기
+    tokens = normalize_address(address).split(" ")
+    while tokens and tokens[0]:
+        coords = table.get(" ".join(tokens))
+        if coords:
+            return coords
+        tokens.pop()
+    return None
+
+
+def geocode_pharmacies(table, overwrite=False, chunk_size=1000):
+    query = select(Pharmacy.id, Pharmacy.address).order_by(Pharmacy.id)
+    if not overwrite:
+        query = query.where((Pharmacy.latitude.is_(None)) | (Pharmacy.longitude.is_(None)))
+
+    report = {"total": 0, "geocoded": 0, "missing": 0, "missing_ids": []}
+    updates = []
+    for pharmacy_id, address in db.session.execute(query).all():
+        report["total"] += 1
+        coords = lookup(table, address)
+        if coords is None:
+            report["missing"] += 1
+            if len(report["missing_ids"]) < 100:
+                report["missing_ids"].append(pharmacy_id)
+            continue
+        updates.append({"id": pharmacy_id, "latitude": coords[0], "longitude": coords[1]})
+        if len(updates) >= chunk_size:
+            report["geocoded"] += _write(updates)
+            updates = []
+    if updates:
+        report["geocoded"] += _write(updates)
+
+    # bulk UPDATE 는 ORM 이벤트를 타지 않으므로 직접 인덱스 갱신 표시
+    bump_pharmacy_version()
+    return report
+
+
+def _write(updates):
+    db.session.execute(update(Pharmacy), updates)
+    db.session.commit()
+    return len(updates)
+
+
+class PharmacyGridIndex:
+    """Pharmacies bucketed into lat/lng grid cells of `cell_deg` degrees (rebuilt on pharmacy_version or ttl)."""
+
+    def __init__(self, cell_deg=0.01, ttl=300):
+        self.cell_deg = cell_deg
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.cells = {}
+        self.count = 0
+
+    def cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def build(self):
+        version = pharmacy_version()
+        cells = {}
+        count = 0
+        rows = db.session.execute(
+            select(Pharmacy.id, Pharmacy.name, Pharmacy.address, Pharmacy.latitude, Pharmacy.longitude)
+            .where(Pharmacy.latitude.is_not(None), Pharmacy.longitude.is_not(None))
+        )
+        for row in rows:
+            cells.setdefault(self.cell(row.latitude, row.longitude), []).append(
+                (row.id, row.name, row.address, row.latitude, row.longitude)
+            )
+            count += 1
+
+        with self.lock:
+            self.cells = cells
+            self.count = count
+            self.version = version
+            self.built_at = time.time()
+
+    def ensure_fresh(self):
+        rebuild_if_stale(self, pharmacy_version)
+
+    def nearby(self, lat, lng, radius_km, k):
+        """k nearest pharmacies within radius_km, as (distance_km, row) sorted by distance."""
+        # 반경을 덮는 격자 범위만 훑음 (경도 1도 길이는 위도에 따라 줄어듦)
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        dlng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lng_lo = self.cell(lat - dlat, lng - dlng)
+        lat_hi, lng_hi = self.cell(lat + dlat, lng + dlng)
+
+        cells = self.cells
+        candidates = []
+        for i in range(lat_lo, lat_hi + 1):
+            for j in range(lng_lo, lng_hi + 1):
+                for row in cells.get((i, j), ()):
+                    distance = haversine_km(lat, lng, row[3], row[4])
+                    if distance <= radius_km:
+                        candidates.append((distance, row))
+        return heapq.nsmallest(k, candidates, key=lambda item: item[0])
+
+
+pharmacy_index = PharmacyGridIndex(
+    cell_deg=float(os.getenv("PHARMACY_GRID_DEG", 0.01)),
+    ttl=int(os.getenv("PHARMACY_INDEX_TTL", 300)),
+)
@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from utils.metrics import metrics
+
+# werkzeug 형식 (예: "scrypt:32768:8:1", "pbkdf2:sha256:600000")
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+
+class HashPoolBusy(Exception):
+    pass
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class HashPool:
+    """Runs password hashing in worker processes, refusing new work once `queue_limit` jobs are waiting.
+
+    workers=0 hashes inline on the calling thread.
+    """
+
+    def __init__(self, workers=2, queue_limit=32, timeout=30):
+        self.workers = workers
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(queue_limit)
+        self.executor = None
+        self.lock = threading.Lock()
+        self._method_prefix = None
+
+    def _executor(self):
+        # gunicorn fork 이후 첫 사용 시 생성
+        if self.executor is None:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def _run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            metrics.incr("hash.rejected")
+            raise HashPoolBusy("Password hashing queue is full")
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            return self._executor().submit(fn, *args).result(timeout=self.timeout)
+        finally:
+            self.slots.release()
+
+    def hash(self, password):
+        return self._run(_hash, password, PASSWORD_HASH_METHOD)
+
+    def hash_many(self, passwords, window=None):
+        # 대량 가입용: 한 번에 window 개까지만 제출 (큐에 수천 건을 쌓지 않음)
+        if self.workers <= 0:
+            return [_hash(password, PASSWORD_HASH_METHOD) for password in passwords]
+        window = window or self.workers * 2
+        executor = self._executor()
+        results, pending = [], deque()
+        for password in passwords:
+            if len(pending) >= window:
+                results.append(pending.popleft().result(timeout=self.timeout))
+            pending.append(executor.submit(_hash, password, PASSWORD_HASH_METHOD))
+        while pending:
+            results.append(pending.popleft().result(timeout=self.timeout))
+        return results
+
+    def verify(self, password_hash, password):
+        return self._run(_verify, password_hash, password)
+
+    def method_prefix(self):
+        # "scrypt" 처럼 파라미터를 생략해도 저장되는 형식("scrypt:32768:8:1")으로 비교
+        if self._method_prefix is None:
+            self._method_prefix = generate_password_hash("", method=PASSWORD_HASH_METHOD).split("$", 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split("$", 1)[0] != self.method_prefix()
+
+
+hash_pool = HashPool(
+    workers=int(os.getenv("HASH_WORKERS", 2)),
+    queue_limit=int(os.getenv("HASH_QUEUE_LIMIT", 32)),
+    timeout=int(os.getenv("HASH_TIMEOUT", 30)),
+)
+
+# 일괄 가져오기 전용 풀: 로그인용 hash_pool 의 워커/큐를 차지하지 않음
+import_hash_pool = HashPool(
+    workers=int(os.getenv("IMPORT_HASH_WORKERS", 1)),
+    timeout=int(os.getenv("HASH_TIMEOUT", 30)),
+)
@@ -0,0 +1,188 @@
+import os
+import time
+import hashlib
+import threading
+from functools import wraps
+from collections import OrderedDict
+from flask import request, jsonify, make_response, Response
+
+MAX_KEY_LENGTH = 255
+
+
+class Entry:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.response = None  # (status, mimetype, body)
+        self.expires_at = None
+
+
+class IdempotencyStore:
+    """(user_id, Idempotency-Key) -> in-flight or completed response, bounded LRU with TTL.
+
+    Only completed entries are evicted; an in-flight key stays until it completes or is abandoned,
+    otherwise a concurrent retry with the same key would run the side effect again.
+    """
+
+    def __init__(self, maxsize=10000, ttl=24 * 3600, wait_timeout=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.replays = 0
+
+    def begin(self, key, fingerprint):
+        """Returns (entry, True) if the caller must do the work, else (existing entry, False)."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at < now:
+                del self.entries[key]
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry, False
+
+            entry = self.entries[key] = Entry(fingerprint)
+            self._evict()
+            return entry, True
+
+    def complete(self, key, entry, response):
+        with self.lock:
+            entry.response = response
+            entry.expires_at = time.time() + self.ttl
+            if self.entries.get(key) is entry:
+                self.entries.move_to_end(key)
+        entry.done.set()
+
+    def _evict(self):
+        # 오래 안 쓰인 완료 항목부터, 처리 중인 항목은 건너뜀 (처리 중 개수는 동시 요청 수로 제한됨)
+        over = len(self.entries) - self.maxsize
+        if over <= 0:
+            return
+        victims = []
+        for key, entry in self.entries.items():
+            if len(victims) >= over:
+                break
+            if entry.response is not None:
+                victims.append(key)
+        for key in victims:
+            del self.entries[key]
+
+    def abandon(self, key, entry):
+        # 5xx/예외는 저장하지 않음 -> 기다리던 요청과 재시도가 다시 처리
+        with self.lock:
+            if self.entries.get(key) is entry:
+                del self.entries[key]
+        entry.done.set()
+
+    def record_replay(self):
+        with self.lock:
+            self.replays += 1
+
+    def stats(self):
+        with self.lock:
+            pending = sum(1 for e in self.entries.values() if e.response is None)
+            return {"size": len(self.entries), "pending": pending, "replays": self.replays}
+
+
+idempotency_store = IdempotencyStore(
+    maxsize=int(os.getenv("IDEMPOTENCY_STORE_SIZE", 10000)),
+    ttl=int(os.getenv("IDEMPOTENCY_TTL", 24 * 3600)),
+    wait_timeout=float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 30)),
+)
+
+
+def fingerprint(method, path, query, body):
+    # 같은 키로 다른 요청을 보내면 422
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}?{query}\n".encode("utf-8"))
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyConflict(Exception):
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+def acquire(user_id, key, request_fp):
+    """Claims (user_id, key) for this request. Shared by @idempotent and asgi.py.
+
+    Returns (store_key, entry) when the caller must do the work and then call finish(), or (None, entry)
+    to replay entry.response. Raises IdempotencyConflict (400/409/422) otherwise.
+    """
+    if len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyConflict(400, f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+    store_key = (str(user_id), key)
+    deadline = time.time() + idempotency_store.wait_timeout
+    while True:
+        entry, owner = idempotency_store.begin(store_key, request_fp)
+        if owner:
+            return store_key, entry
+        if entry.fingerprint != request_fp:
+            raise IdempotencyConflict(422, "Idempotency-Key was already used for a different request")
+        # 같은 키의 첫 요청이 끝날 때까지 대기
+        if not entry.done.wait(max(0.0, deadline - time.time())):
+            raise IdempotencyConflict(409, "A request with this Idempotency-Key is still in progress", retry_after="1")
+        if entry.response is not None:
+            idempotency_store.record_replay()
+            return None, entry
+        # 첫 요청이 실패했으면 이 요청이 다시 처리
+
+
+def finish(store_key, entry, status, mimetype, body, streamed=False):
+    # 5xx/스트리밍 응답은 저장하지 않음
+    if status >= 500 or streamed:
+        idempotency_store.abandon(store_key, entry)
+    else:
+        idempotency_store.complete(store_key, entry, (status, mimetype, body))
+
+
+def replay(entry):
+    status, mimetype, body = entry.response
+    response = Response(body, status=status, mimetype=mimetype)
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def conflict_response(e):
+    response = jsonify({"message": e.message})
+    if e.retry_after:
+        response.headers["Retry-After"] = e.retry_after
+    return response, e.status
+
+
+def idempotent(f):
+    # token_required 아래에 붙여서 사용 (current_user 필요)
+    @wraps(f)
+    def decorated(current_user, *args, **kwargs):
+        key = request.headers.get("Idempotency-Key")
+        if not key:
+            return f(current_user, *args, **kwargs)
+
+        request_fp = fingerprint(request.method, request.path, request.query_string.decode(), request.get_data(cache=True))
+        try:
+            store_key, entry = acquire(current_user["user_id"], key, request_fp)
+        except IdempotencyConflict as e:
+            return conflict_response(e)
+        if store_key is None:
+            return replay(entry)
+
+        try:
+            response = make_response(f(current_user, *args, **kwargs))
+        except Exception:
+            idempotency_store.abandon(store_key, entry)
+            raise
+
+        streamed = response.is_streamed
+        finish(store_key, entry, response.status_code, response.mimetype,
+               None if streamed else response.get_data(), streamed)
+        return response
+
+    return decorated
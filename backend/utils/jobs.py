@@ -0,0 +1,91 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobStore:
+    """Runs functions on a background thread pool and keeps their results by job id.
+
+    Jobs live in process memory, so they are only visible to the gunicorn worker that created them.
+    """
+
+    def __init__(self, workers=4, max_pending=100, max_jobs=1000, ttl=600):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.jobs = OrderedDict()
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    def submit(self, app, owner, fn, *args, **kwargs):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                raise JobQueueFull("Too many pending jobs")
+            self._evict()
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "owner": owner,
+                "status": "pending",
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None,
+            }
+            self.pending += 1
+
+        self.executor.submit(self._run, app, job_id, fn, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _run(self, app, job_id, fn, args, kwargs):
+        self._update(job_id, status="running")
+        try:
+            with app.app_context():
+                result = fn(*args, **kwargs)
+            self._update(job_id, status="done", result=result)
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e))
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if fields.get("status") in ("done", "failed"):
+                job["finished_at"] = time.time()
+
+    def _evict(self):
+        # 끝난 작업만 오래된 순서로 정리
+        now = time.time()
+        for job_id in list(self.jobs):
+            job = self.jobs[job_id]
+            finished = job["finished_at"]
+            if finished is None:
+                continue
+            if now - finished > self.ttl or len(self.jobs) >= self.max_jobs:
+                del self.jobs[job_id]
+
+
+job_store = JobStore(
+    workers=int(os.getenv("JOB_WORKERS", 4)),
+    max_pending=int(os.getenv("JOB_MAX_PENDING", 100)),
+    max_jobs=int(os.getenv("JOB_MAX_STORED", 1000)),
+    ttl=int(os.getenv("JOB_RESULT_TTL", 600)),
+)
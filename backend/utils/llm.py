@@ -0,0 +1,257 @@
+import os
+import random
+import threading
+import time
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+# 프롬프트에서 추천 가능한 성분 목록
+SUPPLEMENT_INGREDIENTS = [
+    "DHA/EPA 제품", "밀크씨슬", "프로바이오틱스", "은행잎 추출물", "홍삼", "비타민 C",
+    "코엔자임 Q10", "멀티비타민", "포스파티딜세린", "L-테아닌", "알로에", "홍경천",
+    "녹차추출물", "칼슘 + 비타민D", "글루코사민", "뮤코다당단백", "콘드로이친",
+    "프락토 올리고당", "쏘팔메토 열매추출물", "비타민A", "루테인", "아스타잔틴", "바나바잎",
+]
+
+
+def fake_completion(model, messages):
+    # 같은 프롬프트에는 항상 같은 성분 2개
+    prompt = "".join(m["content"] for m in messages or [])
+    seed = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest(), 16)
+    first = seed % len(SUPPLEMENT_INGREDIENTS)
+    second = (first + 1 + seed // len(SUPPLEMENT_INGREDIENTS) % (len(SUPPLEMENT_INGREDIENTS) - 1)) % len(SUPPLEMENT_INGREDIENTS)
+    content = f"{SUPPLEMENT_INGREDIENTS[first]}, {SUPPLEMENT_INGREDIENTS[second]}"
+
+    message = SimpleNamespace(role="assistant", content=content)
+    return SimpleNamespace(model=model or "fake", choices=[SimpleNamespace(index=0, message=message)])
+
+
+def fake_chunks(completion, size=3):
+    # stream=True 응답처럼 content 를 몇 글자씩 delta 로 쪼갬
+    content = completion.choices[0].message.content
+    pieces = [content[i:i + size] for i in range(0, len(content), size)]
+    for i, piece in enumerate(pieces):
+        finish_reason = "stop" if i == len(pieces) - 1 else None
+        choice = SimpleNamespace(index=0, delta=SimpleNamespace(content=piece), finish_reason=finish_reason)
+        yield SimpleNamespace(model=completion.model, choices=[choice])
+
+
+class FakeOpenAI:
+    """Offline stand-in for the OpenAI client (only chat.completions.create, with or without stream=True)."""
+
+    def __init__(self, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model=None, messages=None, max_tokens=None, stream=False, timeout=None, **kwargs):
+        fake_failure(self.error_rate)
+        if stream:
+            return self._stream(fake_completion(model, messages))
+        if self.latency:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError("fake LLM request timed out")
+            time.sleep(self.latency)
+        return fake_completion(model, messages)
+
+    def _stream(self, completion):
+        chunks = list(fake_chunks(completion))
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+
+class AsyncFakeOpenAI:
+    """Async variant of FakeOpenAI for the ASGI serving mode."""
+
+    def __init__(self, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model=None, messages=None, max_tokens=None, stream=False, timeout=None, **kwargs):
+        fake_failure(self.error_rate)
+        if stream:
+            return self._stream(fake_completion(model, messages))
+        if self.latency:
+            if timeout is not None and self.latency > timeout:
+                await asyncio.sleep(timeout)
+                raise TimeoutError("fake LLM request timed out")
+            await asyncio.sleep(self.latency)
+        return fake_completion(model, messages)
+
+    async def _stream(self, completion):
+        chunks = list(fake_chunks(completion))
+        for chunk in chunks:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(chunks))
+            yield chunk
+
+
+def fake_latency():
+    return float(os.getenv("FAKE_LLM_LATENCY_MS", 0)) / 1000
+
+
+def fake_error_rate():
+    return float(os.getenv("FAKE_LLM_ERROR_RATE", 0))
+
+
+def fake_failure(error_rate):
+    # 장애 상황 재현용 (FAKE_LLM_ERROR_RATE=0.5 면 절반 실패)
+    if error_rate and random.random() < error_rate:
+        raise ConnectionError("fake LLM backend error")
+
+
+def make_llm_client():
+    # LLM_BACKEND=fake 이면 OpenAI 호출 없이 로컬에서 응답
+    if os.getenv("LLM_BACKEND", "openai") == "fake":
+        return FakeOpenAI(latency=fake_latency(), error_rate=fake_error_rate())
+
+    # 재시도는 LLMGuard 가 시간 예산 안에서 직접 함
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+
+
+def make_async_llm_client():
+    if os.getenv("LLM_BACKEND", "openai") == "fake":
+        return AsyncFakeOpenAI(latency=fake_latency(), error_rate=fake_error_rate())
+
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+
+
+# 클라이언트는 첫 호출 때 생성 (openai 패키지 import 가 무거워서 기동 시간에 포함시키지 않음)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _shared(name, factory):
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = factory()
+    return client
+
+
+def get_llm_client():
+    return _shared("sync", make_llm_client)
+
+
+def get_async_llm_client():
+    return _shared("async", make_async_llm_client)
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failed calls; after `reset_seconds` one trial call is let through."""
+
+    def __init__(self, threshold=5, reset_seconds=30):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.trips = 0
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset_seconds and not self.trial_running:
+                self.trial_running = True  # half-open
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.time()
+                self.trips += 1
+            self.trial_running = False
+
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if self.trial_running or time.time() - self.opened_at >= self.reset_seconds else "open"
+
+    def stats(self):
+        return {"state": self.state(), "consecutive_failures": self.failures, "trips": self.trips}
+
+
+class LLMGuard:
+    """Runs an LLM call within a total time budget: per-attempt timeout, limited retries, circuit breaker."""
+
+    def __init__(self, timeout=8.0, retries=1, budget=12.0, breaker=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.budget = budget
+        self.breaker = breaker or CircuitBreaker()
+
+    def attempts(self):
+        # 남은 예산 안에서만 시도, 시도별 timeout 은 남은 시간으로 잘림
+        if not self.breaker.allow():
+            raise LLMUnavailable("circuit open")
+        deadline = time.perf_counter() + self.budget
+        for attempt in range(self.retries + 1):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0.05:
+                break
+            yield attempt, min(self.timeout, remaining)
+
+    def call(self, create, **kwargs):
+        error = None
+        for attempt, timeout in self.attempts():
+            if attempt:
+                time.sleep(min(0.2 * attempt, max(0.0, timeout - 0.05)))
+            try:
+                response = create(timeout=timeout, **kwargs)
+            except Exception as e:
+                error = e
+                continue
+            self.breaker.success()
+            return response
+        self.breaker.failure()
+        raise LLMUnavailable(f"LLM call failed: {error}") from error
+
+    async def acall(self, create, **kwargs):
+        error = None
+        for attempt, timeout in self.attempts():
+            if attempt:
+                await asyncio.sleep(min(0.2 * attempt, max(0.0, timeout - 0.05)))
+            try:
+                response = await asyncio.wait_for(create(timeout=timeout, **kwargs), timeout)
+            except Exception as e:
+                error = e
+                continue
+            self.breaker.success()
+            return response
+        self.breaker.failure()
+        raise LLMUnavailable(f"LLM call failed: {error}") from error
+
+
+llm_guard = LLMGuard(
+    timeout=float(os.getenv("LLM_TIMEOUT", 8)),
+    retries=int(os.getenv("LLM_RETRIES", 1)),
+    budget=float(os.getenv("LLM_BUDGET", 12)),
+    breaker=CircuitBreaker(
+        threshold=int(os.getenv("LLM_BREAKER_FAILURES", 5)),
+        reset_seconds=float(os.getenv("LLM_BREAKER_RESET", 30)),
+    ),
+)
@@ -0,0 +1,188 @@
+import os
+import time
+import threading
+from contextvars import ContextVar
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 히스토그램 구간 (ms)
+BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")]
+
+
+class Metrics:
+    """In-process counters and latency histograms, served by GET /metrics."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timings = {}
+        self.routes = {}
+        self.phases = {}
+        self.gauges = {}
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self.lock:
+            add_sample(self.timings, name, seconds * 1000)
+
+    def record_phases(self, route, phases):
+        # 요청 단계별(auth, score, commit, llm ...) 히스토그램, 라우트마다 따로
+        with self.lock:
+            timings = self.phases.setdefault(route, {})
+            for name, seconds in phases.items():
+                add_sample(timings, name, seconds * 1000)
+
+    def record_request(self, route, seconds, queries, db_seconds, over_budget):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {"requests": 0, "queries_total": 0, "queries_max": 0, "over_budget": 0}
+            stats["requests"] += 1
+            stats["queries_total"] += queries
+            stats["queries_max"] = max(stats["queries_max"], queries)
+            stats["over_budget"] += int(over_budget)
+        self.observe(f"route {route}", seconds)
+        self.observe(f"db {route}", db_seconds)
+
+    def register_gauge(self, name, fn):
+        # /metrics 조회 시점에 값을 계산 (캐시 통계, 커넥션 풀 상태 등)
+        self.gauges[name] = fn
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.timings.clear()
+            self.routes.clear()
+            self.phases.clear()
+
+    def snapshot(self):
+        with self.lock:
+            timings = {name: summarize_timing(t) for name, t in self.timings.items()}
+            routes = {}
+            for route, stats in self.routes.items():
+                routes[route] = dict(
+                    stats,
+                    queries_mean=round(stats["queries_total"] / stats["requests"], 2),
+                    latency=timings.get(f"route {route}"),
+                    db_time=timings.get(f"db {route}"),
+                )
+            snapshot = {
+                "counters": dict(self.counters),
+                "timings": {name: t for name, t in timings.items() if not name.startswith(("route ", "db "))},
+                "routes": routes,
+                "phases": {route: {name: summarize_timing(t) for name, t in timings.items()}
+                           for route, timings in self.phases.items()},
+            }
+
+        gauges = {}
+        for name, fn in self.gauges.items():
+            try:
+                gauges[name] = fn()
+            except Exception as e:
+                gauges[name] = {"error": str(e)}
+        snapshot["gauges"] = gauges
+        return snapshot
+
+
+def add_sample(timings, name, ms):
+    timing = timings.get(name)
+    if timing is None:
+        timing = timings[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * len(BUCKETS_MS)}
+    timing["count"] += 1
+    timing["total_ms"] += ms
+    timing["max_ms"] = max(timing["max_ms"], ms)
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            timing["buckets"][i] += 1
+            break
+
+
+def bucket_percentile(buckets, count, p, max_ms):
+    # 구간 상한값으로 근사 (마지막 구간은 최대값)
+    target = p / 100 * count
+    seen = 0
+    for bound, n in zip(BUCKETS_MS, buckets):
+        seen += n
+        if seen >= target:
+            return min(bound, round(max_ms, 3))
+    return round(max_ms, 3)
+
+
+def summarize_timing(t):
+    count = t["count"]
+    return {
+        "count": count,
+        "mean_ms": round(t["total_ms"] / count, 3) if count else 0.0,
+        "max_ms": round(t["max_ms"], 3),
+        "p50_ms": bucket_percentile(t["buckets"], count, 50, t["max_ms"]),
+        "p95_ms": bucket_percentile(t["buckets"], count, 95, t["max_ms"]),
+        "p99_ms": bucket_percentile(t["buckets"], count, 99, t["max_ms"]),
+        "buckets": {("le_%g" % bound if bound != float("inf") else "le_inf"): n for bound, n in zip(BUCKETS_MS, t["buckets"])},
+    }
+
+
+metrics = Metrics()
+
+
+# --- 요청별 쿼리 수 / DB 시간 ---
+
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", 20))
+
+
+class QueryStats:
+    # Flask 밖의 요청(asgi.py)용, Flask 요청은 g.query_count / g.db_seconds
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+query_stats = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if has_request_context() and "query_count" in g:
+        g.query_count += 1
+        g.db_seconds += elapsed
+        return
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def record_request(route, seconds, query_count, db_seconds):
+    over_budget = query_count > QUERY_BUDGET
+    if over_budget:
+        print(f"Query budget exceeded: {route} ran {query_count} queries (budget {QUERY_BUDGET})")
+    metrics.record_request(route, seconds, query_count, db_seconds, over_budget)
+
+
+def init_request_metrics(app):
+    @app.before_request
+    def start_request_metrics():
+        g.request_start = time.perf_counter()
+        g.query_count = 0
+        g.db_seconds = 0.0
+
+    @app.after_request
+    def record_request_metrics(response):
+        if "request_start" not in g:
+            return response
+        route = f"{request.method} {request.url_rule.rule if request.url_rule else '<unmatched>'}"
+        record_request(route, time.perf_counter() - g.request_start, g.query_count, g.db_seconds)
+        response.headers["X-Query-Count"] = str(g.query_count)
+        return response
@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+import time
+import uuid
+import random
+import threading
+from collections import Counter
+from flask import g
+from utils.metrics import metrics
+from utils.tracing import route_name
+
+# 샘플링 프로파일러 (기본 꺼짐). PROFILE_SAMPLE_RATE=0.01 이면 요청 1% 를 프로파일링
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", 5)) / 1000
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every `interval` seconds and counts identical stacks.
+
+    write() produces the folded format (`frame;frame;frame count` per line) read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL, max_seconds=PROFILE_MAX_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        deadline = time.perf_counter() + self.max_seconds
+        while not self.stopped.wait(self.interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[fold_stack(frame)] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def frame_name(code):
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}".replace(";", ":").replace(" ", "_")
+
+
+def fold_stack(frame):
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def profile_path(route):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_")
+    return os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}.folded")
+
+
+def init_profiler(app):
+    if PROFILE_SAMPLE_RATE <= 0:
+        return
+
+    @app.before_request
+    def start_profiler():
+        if random.random() < PROFILE_SAMPLE_RATE:
+            g.profiler = SamplingProfiler(threading.get_ident()).start()
+
+    # 스트리밍 응답은 스트림이 끝날 때까지 샘플링
+    @app.teardown_request
+    def stop_profiler(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        profiler.stop()
+        if not profiler.stacks:
+            return
+        try:
+            profiler.write(profile_path(route_name()))
+            metrics.incr("profiler.profiles")
+        except OSError as e:
+            print("Profile write failed:", e)
@@ -0,0 +1,136 @@
+import operator
+from collections import namedtuple
+
+Rule = namedtuple("Rule", ["penalty", "label", "when"])
+
+NORMAL = "정상"
+BASE_SCORE = 100
+
+OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+# 건강검진 수치 기준표: 위에서부터 먼저 맞는 규칙 하나만 적용, when 안의 조건은 OR
+SCORING_RULES = {
+    # 5. 혈압
+    "blood_pressure": [
+        Rule(10, "위험", [("systolic", ">", 180), ("diastolic", ">", 120)]),
+        Rule(8, "위험", [("systolic", ">=", 140), ("diastolic", ">=", 90)]),
+        Rule(5, "위험", [("systolic", ">=", 130), ("diastolic", ">=", 80)]),
+        Rule(3, "주의", [("systolic", ">=", 120)]),
+    ],
+    # 6. 공복혈당
+    "fasting_glucose": [
+        Rule(10, "위험", [("fasting_glucose", ">=", 126)]),
+        Rule(5, "주의", [("fasting_glucose", ">=", 100)]),
+        Rule(12, "위험", [("fasting_glucose", "<", 70)]),
+    ],
+    # 7. BMI
+    "bmi": [
+        Rule(5, "위험", [("bmi", "<", 18.5)]),
+        Rule(7, "위험", [("bmi", ">=", 30)]),
+        Rule(5, "위험", [("bmi", ">=", 25)]),
+        Rule(2, "주의", [("bmi", ">=", 24)]),
+    ],
+    # 8. AST
+    "ast": [
+        Rule(4, "위험", [("ast", ">", 100)]),
+        Rule(2, "위험", [("ast", ">=", 61)]),
+        Rule(1, "주의", [("ast", ">=", 41)]),
+    ],
+    # 9. ALT
+    "alt": [
+        Rule(4, "위험", [("alt", ">", 100)]),
+        Rule(2, "위험", [("alt", ">=", 61)]),
+        Rule(1, "주의", [("alt", ">=", 41)]),
+    ],
+    # 10. eGFR
+    "egfr": [
+        Rule(15, "위험", [("egfr", "<", 15)]),
+        Rule(12, "위험", [("egfr", "<", 30)]),
+        Rule(9, "위험", [("egfr", "<", 45)]),
+        Rule(6, "주의", [("egfr", "<", 60)]),
+        Rule(3, "주의", [("egfr", "<", 90)]),
+    ],
+}
+
+# (항목, 개당 감점, 최대 감점)
+COUNT_PENALTIES = [
+    ("medications", 4, 20),
+    ("past_conditions", 2, 10),
+    ("family_history", 1, 5),
+]
+
+VITAL_COLUMNS = sorted({column for rules in SCORING_RULES.values() for rule in rules for column, _, _ in rule.when})
+LIST_COLUMNS = ["medications", "supplements", "past_conditions", "family_history"]
+
+
+def score_record(data):
+    score = BASE_SCORE
+    lists = {column: data.get(column, []) for column in LIST_COLUMNS}
+    for column, per_item, cap in COUNT_PENALTIES:
+        score -= min(len(lists[column]) * per_item, cap)
+
+    conditions = {}
+    for metric, rules in SCORING_RULES.items():
+        conditions[metric] = NORMAL
+        for rule in rules:
+            if any(OPS[op](data.get(column, 0), threshold) for column, op, threshold in rule.when):
+                score -= rule.penalty
+                conditions[metric] = rule.label
+                break
+
+    return {
+        "score": score,
+        "medications": lists["medications"],
+        "supplements": lists["supplements"],
+        "past_conditions": lists["past_conditions"],
+        "family_history": lists["family_history"],
+        "conditions": conditions
+    }
+
+
+def score_batch(records):
+    """Score many checkup records at once; same output as score_record for each record."""
+    import numpy as np  # 배치 채점에서만 필요해서 기동 시 import 하지 않음
+
+    n = len(records)
+    if n == 0:
+        return []
+
+    values = {
+        column: np.array([float(r.get(column) or 0) for r in records], dtype=np.float64)
+        for column in VITAL_COLUMNS
+    }
+    lists = {column: [r.get(column) or [] for r in records] for column in LIST_COLUMNS}
+
+    score = np.full(n, BASE_SCORE, dtype=np.int64)
+    for column, per_item, cap in COUNT_PENALTIES:
+        counts = np.fromiter((len(items) for items in lists[column]), dtype=np.int64, count=n)
+        score -= np.minimum(counts * per_item, cap)
+
+    labels = {}
+    for metric, rules in SCORING_RULES.items():
+        masks = []
+        for rule in rules:
+            mask = np.zeros(n, dtype=bool)
+            for column, op, threshold in rule.when:
+                mask |= OPS[op](values[column], threshold)
+            masks.append(mask)
+        score -= np.select(masks, [rule.penalty for rule in rules], default=0)
+        labels[metric] = np.select(masks, [rule.label for rule in rules], default=NORMAL)
+
+    return [
+        {
+            "score": int(score[i]),
+            "medications": lists["medications"][i],
+            "supplements": lists["supplements"][i],
+            "past_conditions": lists["past_conditions"][i],
+            "family_history": lists["family_history"][i],
+            "conditions": {metric: str(labels[metric][i]) for metric in SCORING_RULES}
+        }
+        for i in range(n)
+    ]
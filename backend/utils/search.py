@@ -0,0 +1,213 @@
+import os
+import time
+import threading
+from array import array
+from sqlalchemy import select, text
+from db.models import db, Medicine, Ingredient, MedicineIngredient
+from utils.catalog_index import catalog_version
+from utils.versioning import rebuild_if_stale
+
+# 필드별 가중치 (이름 > 성분 > 효능)
+FIELD_WEIGHTS = {"name": 3.0, "ingredients": 2.0, "efficacy": 1.0}
+
+POSTGRES_INGREDIENT_HITS = """
+    WITH hits AS (
+        SELECT mi.medicine_id
+        FROM medicines_ingredients mi
+        JOIN ingredients i ON i.id = mi.ingredient_id
+        WHERE i.name ILIKE :pattern
+    )
+"""
+
+POSTGRES_SEARCH = """
+    SELECT m.id,
+           3 * (m.name ILIKE :pattern)::int
+           + 2 * (m.id IN (SELECT medicine_id FROM hits))::int
+           + coalesce(m.efficacy ILIKE :pattern, false)::int
+           + ts_rank(to_tsvector('simple', coalesce(m.name, '') || ' ' || coalesce(m.efficacy, '')),
+                     plainto_tsquery('simple', :q)) AS rank,
+           count(*) OVER () AS total
+    FROM medicines m
+    WHERE m.name ILIKE :pattern
+       OR m.efficacy ILIKE :pattern
+       OR to_tsvector('simple', coalesce(m.name, '') || ' ' || coalesce(m.efficacy, '')) @@ plainto_tsquery('simple', :q)
+       OR m.id IN (SELECT medicine_id FROM hits)
+    ORDER BY rank DESC, m.id
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def like_pattern(term):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def ngrams(value):
+    value = value.lower()
+    if len(value) < 2:
+        return {value} if value else set()
+    return {value[i:i + 2] for i in range(len(value) - 1)}
+
+
+class MedicineSearch:
+    """Medicine search over name, efficacy and ingredient names.
+
+    On PostgreSQL queries run against trigram/tsvector GIN indexes (created by `flask upgrade-db`). Elsewhere (SQLite) an in-process
+    bigram inverted index narrows candidates before an exact substring check.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.version = None
+        self.built_at = 0
+        self.docs = {}
+        self.postings = {}
+
+    def use_postgres(self):
+        return db.engine.dialect.name == "postgresql"
+
+    def prepare(self):
+        if not self.use_postgres():
+            self.build()
+
+    # --- in-process inverted index ---
+
+    def build(self):
+        version = catalog_version()
+        ingredient_names = {}
+        links = db.session.execute(
+            select(MedicineIngredient.medicine_id, Ingredient.name)
+            .join(Ingredient, Ingredient.id == MedicineIngredient.ingredient_id)
+        )
+        for med_id, name in links:
+            ingredient_names.setdefault(med_id, []).append(name)
+
+        docs = {}
+        postings = {}
+        rows = db.session.execute(
+            select(Medicine.id, Medicine.name, Medicine.efficacy).execution_options(yield_per=10000)
+        )
+        for med_id, name, efficacy in rows:
+            fields = {
+                "name": (name or "").lower(),
+                "ingredients": " ".join(ingredient_names.get(med_id, [])).lower(),
+                "efficacy": (efficacy or "").lower(),
+            }
+            docs[med_id] = fields
+            grams = set()
+            for value in fields.values():
+                grams |= ngrams(value)
+                grams |= set(value)
+            for gram in grams:
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array("l")
+                ids.append(med_id)
+
+        with self.lock:
+            self.docs = docs
+            self.postings = postings
+            self.version = version
+            self.built_at = time.time()
+
+    def ensure_fresh(self):
+        rebuild_if_stale(self, catalog_version)
+
+    def snapshot(self):
+        # 재빌드 교체 중에도 docs/postings 가 같은 빌드에서 나오게
+        with self.lock:
+            return self.docs, self.postings
+
+    def _candidates(self, postings, term):
+        grams = ngrams(term)
+        if not grams:
+            return set()
+        lists = sorted((postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(ids)
+        return candidates
+
+    def _search_memory(self, q, offset, limit):
+        self.ensure_fresh()
+        docs, postings = self.snapshot()
+        terms = q.lower().split()
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for med_id in self._candidates(postings, term):
+                doc = docs[med_id]
+                score = sum(weight for field, weight in FIELD_WEIGHTS.items() if term in doc[field])
+                if score:
+                    if doc["name"].startswith(term):
+                        score += 0.5
+                    term_scores[med_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {med_id: scores[med_id] + s for med_id, s in term_scores.items() if med_id in scores}
+            if not scores:
+                break
+
+        ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], item[0]))
+        return len(ranked), ranked[offset:offset + limit]
+
+    # --- public API ---
+
+    def search(self, q, page=1, per_page=20):
+        offset = (page - 1) * per_page
+        if self.use_postgres():
+            rows = db.session.execute(
+                text(POSTGRES_INGREDIENT_HITS + POSTGRES_SEARCH),
+                {"q": q, "pattern": like_pattern(q), "limit": per_page, "offset": offset},
+            ).all()
+            total = rows[0].total if rows else 0
+            ranked = [(row.id, float(row.rank)) for row in rows]
+        else:
+            total, ranked = self._search_memory(q, offset, per_page)
+
+        ids = [med_id for med_id, _ in ranked]
+        medicines = {m.id: m for m in db.session.query(Medicine).filter(Medicine.id.in_(ids)).all()} if ids else {}
+        ingredients = {}
+        if ids:
+            links = db.session.execute(
+                select(MedicineIngredient.medicine_id, Ingredient.name)
+                .join(Ingredient, Ingredient.id == MedicineIngredient.ingredient_id)
+                .where(MedicineIngredient.medicine_id.in_(ids))
+            )
+            for med_id, name in links:
+                ingredients.setdefault(med_id, []).append(name)
+
+        results = []
+        for med_id, score in ranked:
+            m = medicines.get(med_id)
+            if m is None:
+                continue
+            results.append({
+                "id": m.id,
+                "name": m.name,
+                "manufacturer": m.manufacturer,
+                "price": m.price,
+                "efficacy": m.efficacy,
+                "image_url": m.image_url,
+                "ingredients": ingredients.get(med_id, []),
+                "score": round(score, 4),
+            })
+        return total, results
+
+    def count_efficacy(self, term):
+        # Medicine.efficacy ILIKE '%term%' 개수
+        if self.use_postgres():
+            return db.session.query(Medicine).filter(Medicine.efficacy.ilike(like_pattern(term))).count()
+
+        self.ensure_fresh()
+        docs, postings = self.snapshot()
+        term = term.lower()
+        return sum(1 for med_id in self._candidates(postings, term) if term in docs[med_id]["efficacy"])
+
+
+medicine_search = MedicineSearch(ttl=int(os.getenv("SEARCH_INDEX_TTL", 300)))
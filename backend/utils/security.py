@@ -1,34 +1,162 @@
 from functools import wraps
-from flask import request, abort
+from flask import request, abort, g
 import jwt
 from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from utils.metrics import metrics
+from utils.tracing import record_phase
 import os
+import time
+import hashlib
+import threading
+
+DEFAULT_KID = "default"
+
+_keys = None
+
+
+def jwt_keys():
+    """kid -> secret. JWT_SECRET_KEYS="kid1:secret1,kid2:secret2", otherwise JWT_SECRET_KEY."""
+    global _keys
+    if _keys is None:
+        keys = OrderedDict()
+        for item in os.getenv("JWT_SECRET_KEYS", "").split(","):
+            kid, sep, secret = item.strip().partition(":")
+            if sep and kid and secret:
+                keys[kid] = secret
+        if not keys:
+            keys[DEFAULT_KID] = os.getenv('JWT_SECRET_KEY', 'default_secret')
+        _keys = keys
+    return _keys
+
+
+def active_kid():
+    # 새 토큰 서명에 쓰는 키 (JWT_ACTIVE_KID, 없으면 첫 번째 키)
+    keys = jwt_keys()
+    kid = os.getenv("JWT_ACTIVE_KID")
+    return kid if kid in keys else next(iter(keys))
+
+
+def reload_jwt_keys():
+    global _keys
+    _keys = None
+    return jwt_keys()
+
+
+class TokenCache:
+    """LRU of sha256(token) -> verified claims, dropped once the token's exp has passed."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.data.get(digest)
+            if entry is None:
+                return None
+            claims, kid, exp = entry
+            if (exp is not None and exp <= time.time()) or kid not in jwt_keys():
+                del self.data[digest]
+                return None
+            self.data.move_to_end(digest)
+            return claims
+
+    def set(self, digest, claims, kid):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[digest] = (claims, kid, claims.get("exp"))
+            self.data.move_to_end(digest)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+token_cache = TokenCache(maxsize=int(os.getenv("JWT_CACHE_SIZE", 10000)))
+
+
+def decode_token(token, use_cache=True):
+    """Verify a JWT and return its claims. Raises jwt.InvalidTokenError (incl. ExpiredSignatureError)."""
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    if use_cache:
+        claims = token_cache.get(digest)
+        if claims is not None:
+            metrics.incr("auth.cache_hit")
+            return claims
+        metrics.incr("auth.cache_miss")
+
+    keys = jwt_keys()
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is not None:
+        if kid not in keys:
+            raise jwt.InvalidTokenError("Unknown key id")
+        candidates = [kid]
+    else:
+        # kid 없는 예전 토큰은 모든 키로 시도
+        candidates = list(keys)
+
+    for i, candidate in enumerate(candidates):
+        try:
+            claims = jwt.decode(token, keys[candidate], algorithms=["HS256"])
+        except jwt.InvalidSignatureError:
+            if i == len(candidates) - 1:
+                raise
+            continue
+        if use_cache:
+            token_cache.set(digest, claims, candidate)
+        return claims
+
+
+class AuthError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def request_token(cookies, headers):
+    # Token can come from cookies or Authorization header (iOS)
+    token = cookies.get('jwt') or headers.get('Authorization')
+    if token and token.startswith("Bearer "):
+        token = token.split(" ")[1]
+    return token
+
+
+def authenticate(token):
+    """{"email", "user_id"} of a valid token, otherwise AuthError(401/403). Shared by token_required and asgi.py."""
+    if not token:
+        raise AuthError(401, "Authorization token is missing")
+    try:
+        data = decode_token(token)
+    except jwt.ExpiredSignatureError:
+        raise AuthError(403, "Token is outdated")
+    except (jwt.InvalidTokenError, KeyError):
+        raise AuthError(403, "Bad Credentials")
+    if not data.get("email") or not data.get("user_id"):
+        raise AuthError(403, "Bad Credentials")
+    return {"email": data["email"], "user_id": data["user_id"]}
 
-jwt_secret = os.getenv('JWT_SECRET_KEY', 'default_secret')
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        # Token can come from cookies or Authorization header (iOS)
-        token = request.cookies.get('jwt') or request.headers.get('Authorization')
-        if token and token.startswith("Bearer "):
-            token = token.split(" ")[1]
-
-        if not token:
-            abort(401, description="Authorization token is missing")
+        start = time.perf_counter()
         try:
-            data = jwt.decode(token, jwt_secret, algorithms=["HS256"])
-            current_user = data.get("email")
-            user_id = data.get("user_id")
-
-            if not current_user or not user_id:
-                abort(403, description="Bad Credentials")
-        except jwt.ExpiredSignatureError:
-            abort(403, description="Token is outdated")
-        except (jwt.InvalidTokenError, KeyError):
-            abort(403, description="Bad Credentials")
+            current_user = authenticate(request_token(request.cookies, request.headers))
+            g.user_id = current_user["user_id"]  # replica read-your-writes 용
+        except AuthError as e:
+            abort(e.status, description=e.message)
+        finally:
+            g.auth_seconds = time.perf_counter() - start
+            metrics.observe("auth", g.auth_seconds)
+            record_phase("auth", g.auth_seconds)
 
-        return f({"email": current_user, "user_id": user_id}, *args, **kwargs)
+        return f(current_user, *args, **kwargs)
 
 
     return decorated
@@ -37,4 +165,5 @@ def generate_jwt(payload, hours=6):
     """Generate a JWT with expiration time (default 6 hours)."""
     payload_copy = payload.copy()
     payload_copy["exp"] = datetime.now(timezone.utc) + timedelta(hours=hours)
-    return jwt.encode(payload_copy, jwt_secret, algorithm="HS256")
\ No newline at end of file
+    kid = active_kid()
+    return jwt.encode(payload_copy, jwt_keys()[kid], algorithm="HS256", headers={"kid": kid})
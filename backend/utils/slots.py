@@ -0,0 +1,118 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from db.models import db, Booking
+
+# 상담 가능 시간: 09:00 ~ 17:00, 30분 단위
+OPEN_HOUR = 9
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 16
+
+
+def day_start(day):
+    return datetime(day.year, day.month, day.day, OPEN_HOUR)
+
+
+def slot_times(day):
+    start = day_start(day)
+    return [start + timedelta(minutes=SLOT_MINUTES * i) for i in range(SLOTS_PER_DAY)]
+
+
+def slot_index(dt):
+    offset = dt - day_start(dt)
+    minutes, rem = divmod(offset.total_seconds(), 60)
+    if rem or minutes < 0 or minutes % SLOT_MINUTES:
+        return None
+    index = int(minutes // SLOT_MINUTES)
+    return index if index < SLOTS_PER_DAY else None
+
+
+def free_slots(day, bitmap):
+    return [t for i, t in enumerate(slot_times(day)) if not bitmap >> i & 1]
+
+
+class SlotBitmapCache:
+    """(pharmacy_id, day) -> bitmap of booked slots (bit i = i-th slot of the day).
+
+    create_booking updates entries in place; the TTL bounds staleness from other workers.
+    """
+
+    def __init__(self, ttl=30, maxsize=20000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, pharmacy_ids, days):
+        now = time.time()
+        result = {}
+        missing = []
+        with self.lock:
+            for pharmacy_id in pharmacy_ids:
+                for day in days:
+                    key = (pharmacy_id, day)
+                    entry = self.data.get(key)
+                    if entry and entry[1] >= now:
+                        self.data.move_to_end(key)
+                        result[key] = entry[0]
+                    else:
+                        missing.append(key)
+
+        if missing:
+            loaded = self.load(missing)
+            with self.lock:
+                for key, bitmap in loaded.items():
+                    self._put(key, bitmap, now)
+            result.update(loaded)
+        return result
+
+    def load(self, keys):
+        # 빠진 (약국, 날짜)를 한 번의 범위 쿼리로 채움
+        pharmacy_ids = sorted({pharmacy_id for pharmacy_id, _ in keys})
+        first_day = min(day for _, day in keys)
+        last_day = max(day for _, day in keys)
+        rows = (
+            db.session.query(Booking.pharmacy_id, Booking.booked_time)
+            .filter(
+                Booking.pharmacy_id.in_(pharmacy_ids),
+                Booking.booked_time >= day_start(first_day),
+                Booking.booked_time < day_start(last_day + timedelta(days=1))
+            )
+            .all()
+        )
+
+        bitmaps = {key: 0 for key in keys}
+        for pharmacy_id, booked_time in rows:
+            key = (pharmacy_id, booked_time.date())
+            index = slot_index(booked_time)
+            if key in bitmaps and index is not None:
+                bitmaps[key] |= 1 << index
+        return bitmaps
+
+    def mark_booked(self, pharmacy_id, booked_time):
+        index = slot_index(booked_time)
+        if index is None:
+            return
+        key = (pharmacy_id, booked_time.date())
+        with self.lock:
+            entry = self.data.get(key)
+            if entry:
+                self.data[key] = (entry[0] | 1 << index, entry[1])
+
+    def invalidate(self, pharmacy_id, day):
+        with self.lock:
+            self.data.pop((pharmacy_id, day), None)
+
+    def _put(self, key, bitmap, now):
+        self.data[key] = (bitmap, now + self.ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+slot_cache = SlotBitmapCache(
+    ttl=int(os.getenv("SLOT_CACHE_TTL", 30)),
+    maxsize=int(os.getenv("SLOT_CACHE_SIZE", 20000)),
+)
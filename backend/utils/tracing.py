@@ -0,0 +1,81 @@
+import os
+import time
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from utils.metrics import metrics
+
+# 응답에 Server-Timing 헤더 추가 (SERVER_TIMING=0 이면 헤더만 끄고 집계는 계속)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+
+
+class Phases:
+    """Seconds spent per named phase of one request (same name twice is summed)."""
+
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+
+def current_phases():
+    # 요청 밖(job 워커, CLI)에서는 None
+    if not has_request_context():
+        return None
+    if "phases" not in g:
+        g.phases = Phases()
+    return g.phases
+
+
+@contextmanager
+def phase(name):
+    phases = current_phases()
+    if phases is None:
+        yield
+        return
+    with phases.measure(name):
+        yield
+
+
+def record_phase(name, seconds):
+    phases = current_phases()
+    if phases is not None:
+        phases.add(name, seconds)
+
+
+def server_timing(phases, db_seconds=None, query_count=None, total_seconds=None):
+    # 단계끼리 겹칠 수 있음 (db 는 commit/supplements 안의 쿼리 시간 합)
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.seconds.items()]
+    if db_seconds is not None:
+        entries.append(f'db;dur={db_seconds * 1000:.2f};desc="{query_count} queries"')
+    if total_seconds is not None:
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def route_name():
+    return f"{request.method} {request.url_rule.rule if request.url_rule else '<unmatched>'}"
+
+
+def init_tracing(app):
+    @app.after_request
+    def add_server_timing(response):
+        if SERVER_TIMING and "request_start" in g:
+            response.headers["Server-Timing"] = server_timing(
+                current_phases(), g.db_seconds, g.query_count, time.perf_counter() - g.request_start)
+        return response
+
+    # 스트리밍 응답은 스트림이 끝난 뒤에 호출되므로 llm 단계까지 집계됨
+    @app.teardown_request
+    def record_phases(exc):
+        phases = g.pop("phases", None)
+        if phases is not None and phases.seconds:
+            metrics.record_phases(route_name(), phases.seconds)
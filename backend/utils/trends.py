@@ -0,0 +1,90 @@
+from utils.scoring import SCORING_RULES, VITAL_COLUMNS, score_batch
+
+
+def to_float(value):
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_trends(rows, window=3):
+    """rows: (survey_id, created_at, *VITAL_COLUMNS) oldest first.
+
+    Per point: raw values, rolling mean over the last `window` measurements (missing values
+    skipped), delta from the previous measurement and condition labels; plus the list of
+    condition transitions and a first/last/min/max summary per vital.
+    """
+    import numpy as np
+
+    n = len(rows)
+    if n == 0:
+        return {"count": 0, "window": window, "points": [], "transitions": [], "summary": {}}
+
+    values = np.array([[np.nan if v is None else v for v in row[2:]] for row in rows], dtype=np.float64)
+    present = ~np.isnan(values)
+
+    # 누적합 차이로 구간 평균 (NaN 은 0 으로 더하고 개수에서 제외)
+    sums = np.vstack([np.zeros(len(VITAL_COLUMNS)), np.cumsum(np.where(present, values, 0.0), axis=0)])
+    counts = np.vstack([np.zeros(len(VITAL_COLUMNS)), np.cumsum(present, axis=0)])
+    start = np.maximum(np.arange(1, n + 1) - window, 0)
+    window_sums = sums[1:] - sums[start]
+    window_counts = counts[1:] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rolling = np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+    # 직전 측정값과의 차이 (빠진 값은 앞의 마지막 값으로 채워서 비교)
+    index = np.where(present, np.arange(n)[:, None], -1)
+    np.maximum.accumulate(index, axis=0, out=index)
+    last = np.where(index >= 0, values[np.maximum(index, 0), np.arange(len(VITAL_COLUMNS))], np.nan)
+    previous = np.vstack([np.full(len(VITAL_COLUMNS), np.nan), last[:-1]])
+    deltas = np.where(present, values - previous, np.nan)
+
+    labels = [result["conditions"] for result in score_batch(
+        [{column: row[2 + j] for j, column in enumerate(VITAL_COLUMNS)} for row in rows]
+    )]
+
+    def clean(x):
+        return None if np.isnan(x) else round(float(x), 2)
+
+    points = []
+    for i, row in enumerate(rows):
+        points.append({
+            "survey_id": row[0],
+            "created_at": row[1],
+            "values": {column: clean(values[i, j]) for j, column in enumerate(VITAL_COLUMNS)},
+            "rolling_mean": {column: clean(rolling[i, j]) for j, column in enumerate(VITAL_COLUMNS)},
+            "delta": {column: clean(deltas[i, j]) for j, column in enumerate(VITAL_COLUMNS)},
+            "conditions": labels[i],
+        })
+
+    # 해당 항목 수치가 하나도 없으면 상태는 None (0 으로 채점하지 않음), 변화는 마지막으로 알려진 상태와 비교
+    transitions = []
+    for metric, rules in SCORING_RULES.items():
+        columns = [VITAL_COLUMNS.index(column) for column in {c for rule in rules for c, _, _ in rule.when}]
+        measured = present[:, columns].any(axis=1)
+        known = None
+        for i in range(n):
+            if not measured[i]:
+                labels[i][metric] = None
+                continue
+            if known is not None and labels[i][metric] != known:
+                transitions.append({"metric": metric, "from": known, "to": labels[i][metric],
+                                    "survey_id": rows[i][0], "created_at": rows[i][1]})
+            known = labels[i][metric]
+    transitions.sort(key=lambda t: (t["created_at"], t["survey_id"]))
+
+    summary = {}
+    for j, column in enumerate(VITAL_COLUMNS):
+        measured = values[present[:, j], j]
+        if len(measured):
+            summary[column] = {
+                "count": int(len(measured)),
+                "first": clean(measured[0]),
+                "last": clean(measured[-1]),
+                "change": clean(measured[-1] - measured[0]),
+                "min": clean(measured.min()),
+                "max": clean(measured.max()),
+            }
+
+    return {"count": n, "window": window, "points": points, "transitions": transitions, "summary": summary}
@@ -0,0 +1,74 @@
+import time
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+_trackers = []
+
+
+class ModelVersion:
+    """Process-local counter bumped after a commit that inserted, updated or deleted a tracked model.
+
+    In-memory indexes remember the version they were built from and rebuild when it moves
+    (plus a ttl for changes made by other processes). Bulk insert()/update() statements skip
+    ORM events, so code running them calls bump() itself.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.flag = f"{name}_dirty"
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def current(self):
+        return self.value
+
+    def bump(self):
+        with self.lock:
+            self.value += 1
+
+
+def track_model_version(name, *models):
+    version = ModelVersion(name)
+
+    def mark_dirty(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info[version.flag] = True
+
+    for model in models:
+        for evt in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, evt, mark_dirty)
+    _trackers.append(version)
+    return version
+
+
+def rebuild_if_stale(index, version):
+    """Rebuild `index` when `version()` moved or its ttl passed, one thread at a time.
+
+    Other requests keep answering from the previous index until build() swaps the new one in;
+    only before the first build (nothing to serve yet) do they wait for it.
+    """
+    def stale():
+        return index.version != version() or time.time() - index.built_at > index.ttl
+
+    if not stale() or not index.build_lock.acquire(blocking=index.version is None):
+        return
+    try:
+        if stale():
+            index.build()
+    finally:
+        index.build_lock.release()
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    for version in _trackers:
+        if session.info.pop(version.flag, False):
+            version.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    for version in _trackers:
+        session.info.pop(version.flag, None)